@@ -1,9 +1,12 @@
 import sys
+import argparse
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon, QFontDatabase
 from src.ui.main_window import MainWindow
 from src.utils.app_client import app_client
+from src.utils.config import load_config, parse_source_spec
+from src.utils.threading_plan import apply_threading_plan
 import os
 from pathlib import Path
 import logging
@@ -19,13 +22,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="EcoGrade waste detection")
+    parser.add_argument('--config', help="Path to config.yaml (default: ./config.yaml)")
+    parser.add_argument('--source', help="Frame source: camera:<index>, video:<file>, images:<dir>, replay:<dir> or synthetic")
+    parser.add_argument('--max-speed', action='store_true', help="Play file and synthetic sources as fast as possible")
+    parser.add_argument('--backend', choices=['torch', 'onnxruntime', 'openvino'], help="Inference runtime")
+    parser.add_argument('--record', metavar='DIR', help="Record captured frames to a session under DIR for replay")
+    # Unknown arguments are left for Qt
+    return parser.parse_known_args(argv)
+
 def main():
     try:
+        args, qt_args = parse_args(sys.argv[1:])
+        overrides = {}
+        if args.source:
+            overrides['source'] = parse_source_spec(args.source)
+        if args.max_speed:
+            overrides.setdefault('source', {})['realtime'] = False
+        if args.backend:
+            overrides['inference'] = {'backend': args.backend}
+        if args.record:
+            overrides['recording'] = {'path': args.record}
+        load_config(args.config, overrides)
+        apply_threading_plan()
+
         # Enable high DPI scaling and use software OpenGL for smoother startup
         from PyQt5.QtGui import QGuiApplication
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
         QApplication.setAttribute(Qt.AA_UseSoftwareOpenGL, True)
-        app = QApplication(sys.argv)
+        app = QApplication(sys.argv[:1] + qt_args)
         app.setApplicationName("ECOGRADE")
         app.setStyle('Fusion')
         
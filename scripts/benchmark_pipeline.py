@@ -0,0 +1,128 @@
+"""Run the detection pipeline headless against one or more frame sources and report throughput.
+
+Example:
+    python scripts/benchmark_pipeline.py --source video:belt.mp4 --max-speed
+    python scripts/benchmark_pipeline.py --source synthetic --duration 30
+    python scripts/benchmark_pipeline.py --source video:belt1.mp4 --source video:belt2.mp4
+    python scripts/benchmark_pipeline.py --source replay:recordings/camera_20250101_080000 --max-speed
+
+With --max-speed, file, replay and synthetic sources run lossless: every
+scheduled frame is processed, so repeated runs on the same recording give
+the same detections and comparable FPS numbers. The adaptive rate
+controller is disabled in that mode so the frame skip stays fixed.
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.config import load_config, parse_source_spec
+from src.utils.threading_plan import apply_threading_plan
+from src.utils.video_processor import OUTPUTS, VideoProcessor
+
+
+def average(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def is_finished(processor):
+    """True once a finite source is exhausted and every captured frame was consumed"""
+    stats = processor.frame_mailbox.get_stats()
+    return not processor.capture_thread.is_alive() and stats['taken'] + stats['overwritten'] >= stats['captured']
+
+
+def print_report(processor, elapsed, detections):
+    metrics = processor.performance_metrics
+    stats = processor.frame_mailbox.get_stats()
+    print(f"\n[{processor.name}] {processor.cap.describe() if processor.cap else ''}")
+    print(f"Frames captured: {stats['captured']} ({stats['captured'] / elapsed:.2f} FPS)")
+    print(f"Frames processed: {processor.frames_processed} ({processor.frames_processed / elapsed:.2f} FPS)")
+    print(f"Frames overwritten: {stats['overwritten']}, skipped: {processor.frames_skipped}")
+    print(f"Frames gated (belt empty): {processor.motion_gate.frames_gated}, ROI-cropped: {processor.frames_roi_cropped}")
+    if processor.cascade is not None:
+        print(f"Cascade refines: {processor.cascade.refines}, class changes: {processor.cascade.changed}")
+    track_stats = processor.tracks.get_stats()
+    print(f"Tracks live: {track_stats['live']}, total: {track_stats['total']}, evicted: {track_stats['evicted']}")
+    if processor.flow_tracker.enabled:
+        flow_stats = processor.flow_tracker.get_stats()
+        print(f"Frames tracked between detections: {flow_stats['frames_tracked']}, "
+              f"boxes lost: {flow_stats['boxes_lost']}")
+    rate_stats = processor.rate_controller.get_stats()
+    print(f"Final frame skip: {rate_stats['frame_skip']} ({rate_stats['adjustments']} adjustments, "
+          f"latency {rate_stats['latency_ms']:.0f} ms, target {rate_stats['target_latency_ms']:.0f} ms)")
+    for stage in ('preprocess', 'inference', 'postprocess', 'assignment', 'total', 'frame_age'):
+        print(f"Average {stage}: {average(metrics[stage]):.2f} ms")
+    counts = Counter((d.get('waste_type'), d.get('classification')) for d in detections)
+    print(f"Finalized detections: {len(detections)}")
+    for (waste_type, classification), count in sorted(counts.items()):
+        print(f"  {waste_type} / {classification}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure pipeline FPS without a camera or UI")
+    parser.add_argument('--config', help="Path to config.yaml")
+    parser.add_argument('--source', action='append',
+                        help="camera:<index>, video:<file>, images:<dir>, replay:<dir> or synthetic; repeat for several pipelines")
+    parser.add_argument('--max-speed', action='store_true', help="Run file, replay and synthetic sources unpaced and lossless")
+    parser.add_argument('--backend', choices=['torch', 'onnxruntime', 'openvino'], help="Inference runtime")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds to run (finite sources may end sooner)")
+    parser.add_argument('--render', action='store_true',
+                        help="Render the model, residue and mask views as if the UI were showing them")
+    args = parser.parse_args()
+
+    specs = args.source or ['synthetic']
+    sources = []
+    for spec in specs:
+        source = parse_source_spec(spec)
+        source['realtime'] = not args.max_speed
+        sources.append(source)
+    overrides = {'source': sources[0]}
+    if args.backend:
+        overrides['inference'] = {'backend': args.backend}
+    if args.max_speed:
+        overrides['processing'] = {'adaptive': False}  # A fixed skip keeps lossless runs reproducible
+    config = load_config(args.config, overrides)
+    apply_threading_plan()
+
+    # All pipelines share one model and one inference scheduler
+    processors = []
+    detections = {}
+    for index, source in enumerate(sources):
+        processor = VideoProcessor(source=dict(config['source'], **source), name=f"belt{index + 1}")
+        processor.publish_detections = False  # Never write to the database or drive the servos
+        if args.render:
+            for output in OUTPUTS:
+                processor.subscribe(output)
+        detections[processor.name] = []
+        processor.detection_callback = detections[processor.name].append
+        processor.initialize()
+        processors.append(processor)
+    for processor in processors:
+        processor.start()
+
+    start_time = time.monotonic()
+    try:
+        while time.monotonic() - start_time < args.duration:
+            if all(is_finished(processor) for processor in processors):
+                break
+            time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.monotonic() - start_time
+    for processor in processors:
+        processor.stop()
+
+    print("\nPipeline benchmark")
+    print(f"Mode: {'max speed' if args.max_speed else 'realtime'}, elapsed: {elapsed:.2f} s")
+    for processor in processors:
+        print_report(processor, elapsed, detections[processor.name])
+        processor.release_camera()
+    print(f"\nInference backend: {processors[0].scheduler.model_entry.describe()}")
+    print(f"Inference requests per pipeline: {processors[0].scheduler.get_stats()}")
+
+
+if __name__ == '__main__':
+    main()
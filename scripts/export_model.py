@@ -0,0 +1,86 @@
+"""Export best.pt for an optimized CPU runtime and check it against PyTorch.
+
+Example:
+    python scripts/export_model.py --format onnx
+    python scripts/export_model.py --format openvino --frames replay:recordings/belt1 --num-frames 200
+
+The parity check runs the PyTorch model and the exported model on the same
+frames and fails (exit code 1) if the detections disagree.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.config import load_config, parse_source_spec
+from src.utils.frame_source import create_frame_source
+from src.utils.inference_backends import create_backend, export_model, check_parity
+
+
+def load_frames(spec, count):
+    """Read up to count frames from a source spec for the parity check"""
+    source_config = dict(load_config()['source'], **parse_source_spec(spec))
+    source_config['realtime'] = False
+    source = create_frame_source(source_config)
+    source.open()
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = source.read()
+            if not ret:
+                if source.finished:
+                    break
+                continue
+            frames.append(frame)
+    finally:
+        source.release()
+    return frames
+
+
+def print_report(backend, report):
+    print(f"\nParity check: {backend} vs torch on {report['frames']} frames")
+    print(f"Detections (torch/{backend}): {report['reference_detections']}/{report['candidate_detections']}")
+    print(f"Recall: {report['recall']:.3f}  Precision: {report['precision']:.3f}  Mean IoU: {report['mean_iou']:.3f}")
+    print(f"Max confidence difference: {report['max_confidence_diff']:.3f}")
+    print(f"Mean latency: torch {report['reference_ms']:.1f} ms, {backend} {report['candidate_ms']:.1f} ms "
+          f"({report['reference_ms'] / max(report['candidate_ms'], 1e-9):.2f}x)")
+    print("PASSED" if report['passed'] else "FAILED")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export YOLO weights for ONNX Runtime or OpenVINO")
+    parser.add_argument('--config', help="Path to config.yaml")
+    parser.add_argument('--weights', help="PyTorch weights (default: inference.model_path from config)")
+    parser.add_argument('--format', choices=['onnxruntime', 'openvino', 'all'], default='all')
+    parser.add_argument('--imgsz', type=int, help="Input size (default: inference.imgsz from config)")
+    parser.add_argument('--frames', default='synthetic', help="Source spec for parity frames, e.g. images:<dir> or replay:<dir>")
+    parser.add_argument('--num-frames', type=int, default=50)
+    parser.add_argument('--conf', type=float, default=0.5)
+    parser.add_argument('--no-check', action='store_true', help="Skip the parity check")
+    args = parser.parse_args()
+
+    inference = load_config(args.config)['inference']
+    weights = args.weights or inference['model_path']
+    imgsz = args.imgsz or inference['imgsz']
+    backends = ['onnxruntime', 'openvino'] if args.format == 'all' else [args.format]
+
+    for backend in backends:
+        export_model(weights, backend, imgsz)
+    if args.no_check:
+        return
+
+    frames = load_frames(args.frames, args.num_frames)
+    if not frames:
+        sys.exit(f"No frames available from {args.frames} for the parity check")
+    reference = create_backend('torch', weights, imgsz)
+    failed = False
+    for backend in backends:
+        report = check_parity(reference, create_backend(backend, weights, imgsz), frames, conf=args.conf)
+        print_report(backend, report)
+        failed = failed or not report['passed']
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Build an INT8 variant of best.pt and report its accuracy and speed against FP32.
+
+Example:
+    python scripts/quantize_model.py --format onnxruntime --calibration data/calibration
+    python scripts/quantize_model.py --format openvino --calibration data/calibration --eval data/val/images
+
+Calibration uses a folder of representative belt frames. Evaluation images may
+have YOLO .txt labels next to them (or in a sibling 'labels' folder); without
+labels INT8 is scored against the FP32 detections. Select the result with
+inference.precision: int8 in config.yaml.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.config import load_config
+from src.utils.inference_backends import create_backend, export_model, resolve_model_path
+from src.utils.quantization import (quantize_onnx, quantize_openvino, evaluate_quantized,
+                                    format_report, load_samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 post-training quantization with an accuracy report")
+    parser.add_argument('--config', help="Path to config.yaml")
+    parser.add_argument('--weights', help="PyTorch weights (default: inference.model_path from config)")
+    parser.add_argument('--format', choices=['onnxruntime', 'openvino'], default='onnxruntime')
+    parser.add_argument('--imgsz', type=int, help="Input size (default: inference.imgsz from config)")
+    parser.add_argument('--calibration', required=True, help="Folder of representative frames")
+    parser.add_argument('--num-calibration', type=int, default=300, help="Maximum calibration frames")
+    parser.add_argument('--eval', help="Folder of evaluation images (default: the calibration folder)")
+    parser.add_argument('--conf', type=float, default=0.5)
+    parser.add_argument('--report', default='quantization_report.md', help="Where to write the report")
+    args = parser.parse_args()
+
+    inference = load_config(args.config)['inference']
+    weights = args.weights or inference['model_path']
+    imgsz = args.imgsz or inference['imgsz']
+
+    fp32_path = resolve_model_path(weights, args.format)
+    if not Path(fp32_path).exists():
+        export_model(weights, args.format, imgsz)
+
+    calibration = [frame for frame, _ in load_samples(args.calibration, args.num_calibration)]
+    if not calibration:
+        sys.exit(f"No calibration images found in {args.calibration}")
+    print(f"Calibrating on {len(calibration)} frames...")
+    int8_path = resolve_model_path(weights, args.format, 'int8')
+    if args.format == 'onnxruntime':
+        quantize_onnx(fp32_path, calibration, int8_path, imgsz)
+    else:
+        quantize_openvino(fp32_path, calibration, int8_path, imgsz)
+
+    samples = load_samples(args.eval) if args.eval else load_samples(args.calibration)
+    report = evaluate_quantized(create_backend(args.format, weights, imgsz),
+                                create_backend(args.format, weights, imgsz, 'int8'),
+                                samples, conf=args.conf)
+    text = format_report(report)
+    Path(args.report).write_text(text)
+    print(text)
+    print(f"Report written to {args.report}")
+
+
+if __name__ == '__main__':
+    main()
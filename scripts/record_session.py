@@ -0,0 +1,52 @@
+"""Record frames from a source to a session directory without running detection.
+
+Example:
+    python scripts/record_session.py --source camera:0 --output recordings/belt1 --duration 600
+    python scripts/record_session.py --info recordings/belt1
+
+Recorded sessions can be replayed with --source replay:<dir> in main.py and
+scripts/benchmark_pipeline.py.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.config import load_config, parse_source_spec
+from src.utils.frame_source import create_frame_source
+from src.utils.session_recording import record_frames, describe_session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a session for deterministic replay")
+    parser.add_argument('--config', help="Path to config.yaml")
+    parser.add_argument('--source', default='camera:0', help="camera:<index>, video:<file>, images:<dir> or synthetic")
+    parser.add_argument('--output', help="Session directory to create")
+    parser.add_argument('--duration', type=float, help="Seconds to record (default: until the source ends or Ctrl+C)")
+    parser.add_argument('--encoding', choices=['jpeg', 'raw'], help="Frame encoding (default from config)")
+    parser.add_argument('--info', metavar='DIR', help="Print a summary of an existing session and exit")
+    args = parser.parse_args()
+
+    if args.info:
+        for key, value in describe_session(args.info).items():
+            print(f"{key}: {value}")
+        return
+    if not args.output:
+        parser.error("--output is required when recording")
+
+    config = load_config(args.config, {'source': parse_source_spec(args.source)})
+    recording = config['recording']
+    source = create_frame_source(config['source'])
+    source.open()
+    try:
+        record_frames(source, args.output, duration=args.duration,
+                      encoding=args.encoding or recording['encoding'],
+                      jpeg_quality=recording['jpeg_quality'],
+                      chunk_size_mb=recording['chunk_size_mb'])
+    finally:
+        source.release()
+
+
+if __name__ == '__main__':
+    main()
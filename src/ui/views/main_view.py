@@ -6,6 +6,7 @@ from src.ui.widgets.base_widgets import RoundedWidget
 from src.ui.widgets.camera_widget import CameraWidget
 from src.ui.widgets.detection_result_widget import DetectionResultWidget
 from src.utils.video_processor import VideoProcessor
+from src.utils.model_registry import WARMING_UP
 import pyqtgraph as pg
 import numpy as np
 from datetime import datetime, timedelta
@@ -117,12 +118,15 @@ class MainView(QWidget):
         self.last_valid_detection = None
         self.is_two_camera_layout = False  # Start with single camera layout
         self.is_detecting = False  # Track detection state
-        self.frame_skip = 2  # Reduce from 3 to 2
-        self.detection_interval = 0.1  # Reduce from 0.2 to 0.1
-        self.processing_size = (416, 416)  # Increase from (320, 240)
-        self.update_interval = 33  # Increase from 50ms to ~30 FPS
         self.setup_ui()
         self._show_no_object_detected()
+
+        # Load and warm up the model in the background while the window is shown
+        self.model_entry = self.video_processor.preload_model()
+        self.model_status_timer = QTimer(self)
+        self.model_status_timer.timeout.connect(self.update_model_status)
+        self.model_status_timer.start(250)
+        self.update_model_status()
         
     def setup_ui(self):
         # Set main background color to match analytics
@@ -236,9 +240,21 @@ class MainView(QWidget):
         """)
         self.layout_btn.clicked.connect(self.toggle_camera_layout)
         
+        # Model loading status, shown until the model is ready
+        self.model_status_label = QLabel("")
+        self.model_status_label.setFont(QFont('Inter', 11))
+        self.model_status_label.setStyleSheet("""
+            QLabel {
+                color: #f59e0b;
+                background-color: transparent;
+                border: none;
+            }
+        """)
+
         button_layout.addStretch()
         button_layout.addWidget(self.start_btn)
         button_layout.addWidget(self.layout_btn)
+        button_layout.addWidget(self.model_status_label)
         button_layout.addStretch()
         
         self.left_layout.addWidget(self.camera_container, 1)
@@ -589,6 +605,26 @@ class MainView(QWidget):
         self.classification_widget.update_value('No object detected')
         self.confidence_widget.update_value('0.00%')
 
+    def update_model_status(self):
+        """Reflect the background model load in the start button and status label"""
+        entry = self.model_entry
+        if entry.is_ready:
+            self.model_status_timer.stop()
+            self.model_status_label.hide()
+            self.start_btn.setEnabled(True)
+            self.start_btn.setToolTip("")
+        elif entry.done:
+            self.model_status_timer.stop()
+            self.model_status_label.setText("Model failed to load")
+            self.model_status_label.setStyleSheet("QLabel { color: #ef4444; background-color: transparent; border: none; }")
+            self.start_btn.setEnabled(False)
+            self.start_btn.setToolTip(entry.error)
+        else:
+            text = "Warming up model..." if entry.state == WARMING_UP else "Loading model..."
+            self.model_status_label.setText(text)
+            self.start_btn.setEnabled(False)
+            self.start_btn.setToolTip(text)
+
     def toggle_detection(self):
         """Toggle detection on/off"""
         try:
@@ -4,8 +4,16 @@ from PyQt5.QtGui import QImage, QPixmap, QColor, QFont
 import cv2
 import numpy as np
 from src.utils.video_processor import VideoProcessor
+from src.utils.config import get_config
 import time
 
+# Pipeline output each view displays
+VIEW_OUTPUTS = {
+    'object_detection': 'model',
+    'residue_scan': 'residue',
+    'mask': 'mask'
+}
+
 class CameraWidget(QLabel):
     result_updated = pyqtSignal(dict)  # Signal to emit detection results
     
@@ -43,9 +51,10 @@ class CameraWidget(QLabel):
         self.camera_started = False
         self.error_message = None
         self.last_update_time = 0
-        self.update_interval = 50  # 20 FPS (1000ms / 20 = 50ms)
+        self.update_interval = get_config()['display']['update_interval_ms']
         self.frame_buffer = None
         self.processing_frame = False
+        self.output = VIEW_OUTPUTS.get(view_type, 'model')
     
     def enterEvent(self, event):
         # Increase glow on hover
@@ -68,6 +77,9 @@ class CameraWidget(QLabel):
                 self.setText("")
                 self.update()
                 
+                # Ask the pipeline to render this view only while it is shown
+                self.video_processor.subscribe(self.output)
+                
                 # Start camera with reduced update frequency
                 self.update_timer.start(self.update_interval)
                 self.camera_started = True
@@ -102,44 +114,41 @@ class CameraWidget(QLabel):
         if current_time - self.last_update_time < self.update_interval:
             return
 
-        if self.video_processor and self.video_processor.latest_result is not None:
-            result = self.video_processor.latest_result
-            frames = result['frames']
+        result = self.video_processor.acquire_latest_result() if self.video_processor else None
+        if result is not None:
+            # Hold the result's frame buffers until they are copied into frame_buffer
+            try:
+                frames = result['frames']
             
-            # Select frame based on view type
-            if self.view_type == "object_detection":
-                frame = frames['model']
-            elif self.view_type == "residue_scan":
-                frame = frames['residue']
-            elif self.view_type == "mask":
-                frame = frames['mask']
-            else:
-                frame = frames['model']
+                # Select frame based on view type; None if the result predates subscribe()
+                frame = frames[self.output]
 
-            if frame is not None and frame.size > 0:
-                # Cache the frame buffer
-                if self.frame_buffer is None or self.frame_buffer.shape != frame.shape:
-                    self.frame_buffer = np.zeros_like(frame)
+                if frame is not None and frame.size > 0:
+                    # Cache the frame buffer
+                    if self.frame_buffer is None or self.frame_buffer.shape != frame.shape:
+                        self.frame_buffer = np.zeros_like(frame)
                 
-                # Update frame buffer
-                np.copyto(self.frame_buffer, frame)
+                    # Update frame buffer
+                    np.copyto(self.frame_buffer, frame)
                 
-                # Convert to QImage only when needed
-                height, width, channel = self.frame_buffer.shape
-                bytes_per_line = 3 * width
-                q_image = QImage(self.frame_buffer.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
+                    # Convert to QImage only when needed
+                    height, width, channel = self.frame_buffer.shape
+                    bytes_per_line = 3 * width
+                    q_image = QImage(self.frame_buffer.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
                 
-                # Scale pixmap efficiently to 80% of container size
-                pixmap = QPixmap.fromImage(q_image)
-                target_size = QSize(int(self.width() * 0.9), int(self.height() * 0.9))
-                scaled_pixmap = pixmap.scaled(target_size, Qt.KeepAspectRatio, Qt.FastTransformation)
-                self.setPixmap(scaled_pixmap)
+                    # Scale pixmap efficiently to 80% of container size
+                    pixmap = QPixmap.fromImage(q_image)
+                    target_size = QSize(int(self.width() * 0.9), int(self.height() * 0.9))
+                    scaled_pixmap = pixmap.scaled(target_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+                    self.setPixmap(scaled_pixmap)
                 
-                # Emit result
-                self.result_updated.emit(result['data'])
-                self.last_update_time = current_time
-            else:
-                self.handle_empty_frame()
+                    # Emit result
+                    self.result_updated.emit(result['data'])
+                    self.last_update_time = current_time
+                else:
+                    self.handle_empty_frame()
+            finally:
+                self.video_processor.release_result(result)
         else:
             self.handle_empty_frame()
 
@@ -169,6 +178,8 @@ class CameraWidget(QLabel):
     
     def stop_camera(self):
         self.update_timer.stop()
+        if self.camera_started and self.video_processor:
+            self.video_processor.unsubscribe(self.output)
         self.camera_started = False
         # Force text to be visible
         self.setStyleSheet("""
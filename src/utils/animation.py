@@ -1,10 +1,12 @@
 import cv2
 import numpy as np
 
-def add_detection_animation(frame, detected, boxes, last_classification, animation_time):
-    """Add animation effects to detected objects"""
-    # Create a copy of the frame
-    animated_frame = frame.copy()
+def add_detection_animation(frame, detected, boxes, last_classification, animation_time, in_place=False):
+    """Add animation effects to detected objects.
+
+    With in_place=True the effects are drawn directly into frame instead of a copy.
+    """
+    animated_frame = frame if in_place else frame.copy()
     
     if detected and boxes:
         for x1, y1, x2, y2, cls_id, conf in boxes:
@@ -43,11 +45,19 @@ def add_detection_animation(frame, detected, boxes, last_classification, animati
             cv2.line(animated_frame, (x2 - corner_size, y2), (x2, y2), border_color, corner_thickness)
             cv2.line(animated_frame, (x2, y2), (x2, y2 - corner_size), border_color, corner_thickness)
             
-            # Add a subtle glow effect
-            glow = np.zeros_like(frame)
-            cv2.rectangle(glow, (x1, y1), (x2, y2), border_color, border_thickness + 4)
+            # Add a subtle glow effect. The glow is zero away from the border, so it
+            # is only drawn, blurred and blended in a region around the box
+            height, width = animated_frame.shape[:2]
+            margin = border_thickness + 4 + 8  # Line half-width plus the blur radius, with headroom
+            gx1, gy1 = max(0, min(x1, x2) - margin), max(0, min(y1, y2) - margin)
+            gx2, gy2 = min(width, max(x1, x2) + margin), min(height, max(y1, y2) + margin)
+            if gx2 <= gx1 or gy2 <= gy1:
+                continue
+            glow = np.zeros((gy2 - gy1, gx2 - gx1, 3), dtype=animated_frame.dtype)
+            cv2.rectangle(glow, (x1 - gx1, y1 - gy1), (x2 - gx1, y2 - gy1), border_color, border_thickness + 4)
             glow = cv2.GaussianBlur(glow, (15, 15), 0)
-            animated_frame = cv2.addWeighted(animated_frame, 1, glow, alpha * 0.3, 0)
+            region = animated_frame[gy1:gy2, gx1:gx2]
+            cv2.addWeighted(region, 1, glow, alpha * 0.3, 0, dst=region)
     
     return animated_frame
 
@@ -0,0 +1,85 @@
+import threading
+import numpy as np
+
+
+class BufferLease:
+    """A pooled array with a reference count.
+
+    The array goes back to its pool when the last holder calls release().
+    Holders that hand the array to another thread call retain() first.
+    """
+    __slots__ = ('pool', 'array', 'refs')
+
+    def __init__(self, pool, array):
+        self.pool = pool
+        self.array = array
+        self.refs = 1
+
+    def retain(self):
+        with self.pool.lock:
+            if self.refs <= 0:
+                raise RuntimeError("Cannot retain a buffer that was already returned to the pool")
+            self.refs += 1
+        return self
+
+    def release(self):
+        self.pool._release(self)
+
+
+class BufferPool:
+    """Recycles frame-sized arrays so the pipeline stops allocating per frame"""
+
+    def __init__(self, max_free_per_shape=4):
+        self.lock = threading.Lock()
+        self.max_free_per_shape = max_free_per_shape
+        self.free = {}  # (shape, dtype) -> list of arrays
+        self.allocated = 0
+        self.reused = 0
+        self.outstanding = 0
+
+    def lease(self, shape, dtype=np.uint8, zero=False):
+        """Lease an array of the given shape; contents are undefined unless zero=True"""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self.lock:
+            free = self.free.get(key)
+            array = free.pop() if free else None
+            if array is None:
+                self.allocated += 1
+            else:
+                self.reused += 1
+            self.outstanding += 1
+        if array is None:
+            array = np.empty(shape, dtype=dtype)
+        if zero:
+            array.fill(0)
+        return BufferLease(self, array)
+
+    def adopt(self, array):
+        """Wrap an array allocated elsewhere so it joins the pool when released"""
+        with self.lock:
+            self.allocated += 1
+            self.outstanding += 1
+        return BufferLease(self, array)
+
+    def _release(self, lease):
+        with self.lock:
+            lease.refs -= 1
+            if lease.refs > 0:
+                return
+            if lease.refs < 0:
+                raise RuntimeError("Buffer released more times than it was retained")
+            self.outstanding -= 1
+            key = (lease.array.shape, lease.array.dtype.str)
+            free = self.free.setdefault(key, [])
+            if len(free) < self.max_free_per_shape:
+                free.append(lease.array)
+            lease.array = None
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                'allocated': self.allocated,
+                'reused': self.reused,
+                'outstanding': self.outstanding,
+                'free': sum(len(arrays) for arrays in self.free.values())
+            }
@@ -0,0 +1,76 @@
+import numpy as np
+
+from src.utils.inference_backends import box_iou
+from src.utils.preprocess import TensorLetterbox, model_input_shape, unletterbox_boxes
+
+
+class CascadeRefiner:
+    """Second opinion from a large model on the scout detections that are in doubt.
+
+    The pipeline runs a small scout model on every processed frame. A scout
+    detection is refined when its confidence falls in the ambiguous band
+    [low, high) or its class differs from the class the same tracked object
+    had in the previous frame. Refining runs the large model on a crop
+    around the box only, and its best overlapping detection replaces the
+    scout's class and confidence. At most max_refines refinements run per
+    frame, and none until the large model has finished loading.
+    """
+
+    def __init__(self, scheduler, imgsz=640, dynamic_input=True, low=0.5, high=0.8, crop_margin=0.15,
+                 max_refines=2, min_iou=0.3):
+        self.scheduler = scheduler
+        self.imgsz = imgsz
+        self.dynamic_input = dynamic_input
+        self.low = low
+        self.high = high
+        self.crop_margin = crop_margin
+        self.max_refines = max_refines
+        self.min_iou = min_iou
+        self.tensor_letterbox = TensorLetterbox()
+        self.refines_left = max_refines
+        self.refines = 0
+        self.changed = 0
+
+    def start_frame(self):
+        self.refines_left = self.max_refines
+
+    def needs_refine(self, conf, cls_id, previous_cls=None):
+        if self.refines_left <= 0 or not self.scheduler.is_ready:
+            return False
+        if self.low <= conf < self.high:
+            return True
+        return previous_cls is not None and previous_cls != cls_id
+
+    def refine(self, image, box, cls_id, pipeline=None):
+        """Run the large model around the scout's box (x1, y1, x2, y2); returns (conf, cls_id) or None"""
+        self.refines_left -= 1
+        x1, y1, x2, y2 = box
+        margin_x = int((x2 - x1) * self.crop_margin)
+        margin_y = int((y2 - y1) * self.crop_margin)
+        cx1, cy1 = max(0, x1 - margin_x), max(0, y1 - margin_y)
+        cx2, cy2 = min(image.shape[1], x2 + margin_x), min(image.shape[0], y2 + margin_y)
+        if cx2 <= cx1 or cy2 <= cy1:
+            return None
+
+        crop = image[cy1:cy2, cx1:cx2]
+        input_shape = model_input_shape(crop.shape[0], crop.shape[1], self.imgsz, self.dynamic_input)
+        tensor, scale, pad = self.tensor_letterbox(crop, input_shape)
+        detections = self.scheduler.detect(tensor, pipeline=pipeline, conf=self.low)
+        detections = unletterbox_boxes(detections, scale, pad, (cx1, cy1), image.shape)
+        self.refines += 1
+        if len(detections) == 0:
+            return None
+
+        # Best large-model detection that covers the same object as the scout box
+        iou = box_iou(np.array(box, dtype=np.float32), detections[:, :4])
+        candidates = np.flatnonzero(iou >= self.min_iou)
+        if len(candidates) == 0:
+            return None
+        best = candidates[np.argmax(detections[candidates, 4])]
+        refined_cls = int(detections[best, 5])
+        if refined_cls != cls_id:
+            self.changed += 1
+        return float(detections[best, 4]), refined_cls
+
+    def get_stats(self):
+        return {'refines': self.refines, 'changed': self.changed}
@@ -0,0 +1,150 @@
+import copy
+import os
+from pathlib import Path
+
+import yaml
+
+DEFAULT_CONFIG_PATH = 'config.yaml'
+
+# Defaults used when config.yaml is missing or leaves a key out
+DEFAULT_CONFIG = {
+    'source': {
+        'type': 'camera',   # camera | video | images | synthetic | replay
+        'path': 0,          # Camera index, video file, image directory or session directory
+        'width': 640,
+        'height': 480,
+        'fps': 30,
+        'realtime': True,   # Pace file sources at their nominal fps; False runs lossless at max speed
+        'loop': False
+    },
+    'capture': {
+        # 'decode_on_demand' grabs every frame to keep the driver buffer drained
+        # but only decodes frames that will be processed; 'read' decodes all
+        'mode': 'decode_on_demand'
+    },
+    'processing': {
+        'frame_skip': 3,            # Process every Nth captured frame (starting value when adaptive)
+        'adaptive': True,           # Let the rate controller tune frame_skip to meet target_latency_ms
+        'target_latency_ms': 200,   # Capture-to-result latency the controller aims for
+        'min_frame_skip': 1,
+        'max_frame_skip': 15,
+        'detection_interval': 0.2   # Seconds between detections in the legacy run_detection_loop
+    },
+    'motion_gate': {
+        'enabled': True,            # Skip inference while the belt is empty
+        'size': [160, 120],         # Grayscale comparison image (width, height)
+        'threshold': 25,            # Gray-level difference that counts as a changed pixel
+        'min_changed_fraction': 0.01,  # Share of changed pixels that means something is on the belt
+        'learning_rate': 0.02,      # Background update rate while the belt is empty
+        'occupied_learning_rate': 0.001,  # ... and while it is occupied
+        'hold_frames': 3            # Processed frames the gate stays open after the change disappears
+    },
+    'roi': {
+        'enabled': True,            # Run the detector on the changed region only (needs the motion gate)
+        'margin': 32,               # Pixels added around the changed region
+        'min_size': 160             # Smallest region width/height sent to the detector
+    },
+    'threading': {
+        'enabled': True,            # Size the torch/OpenCV thread pools at startup
+        'ui_cores': 1,              # Cores left to the Qt thread and the capture threads
+        'inference_threads': 0,     # Torch intra-op threads; 0 uses every core not left to the UI
+        'opencv_threads': 0,        # 0 picks 1 on machines with up to 4 cores, else 2
+        'pin_threads': False        # Bind capture and inference threads to their cores (Linux only)
+    },
+    'display': {
+        'update_interval_ms': 50    # Camera widget refresh period (20 FPS)
+    },
+    'inference': {
+        'backend': 'torch',     # torch | onnxruntime | openvino
+        'model_path': 'best.pt',  # Exported models are found next to the .pt weights
+        'imgsz': 640,           # Network input size; exports must use the same value
+        'precision': 'fp32',    # fp32 | int8 (int8 needs onnxruntime or openvino)
+        'task': 'detect',       # detect | segment; segment scores residue on the instance masks only
+        'mask_downsample': 2,   # Frame pixels per instance mask cell, per side
+        'warmup_runs': 3,       # Dummy inferences run after loading, before the model reports ready
+        'workers': 0,           # >0 runs inference in that many worker processes instead of a thread
+        'threads_per_worker': 0  # Torch threads per worker process; 0 splits the inference threads evenly
+    },
+    'cascade': {
+        'enabled': False,           # Run a small scout model on every frame and model_path only when unsure
+        'scout_model_path': 'best_small.pt',
+        'ambiguous_low': 0.5,       # Scout confidence band in which the large model is asked
+        'ambiguous_high': 0.8,
+        'crop_margin': 0.15,        # Context added around the scout box, as a fraction of its size
+        'max_refines_per_frame': 2
+    },
+    'interframe': {
+        'enabled': False,   # Decode every frame and move the boxes with optical flow between inference frames
+        'scale': 0.5,       # Resolution of the optical flow images relative to the frame
+        'max_points': 20,   # Features followed per box
+        'min_points': 4,    # A box is dropped once fewer of its features are found
+        'win_size': 15      # Lucas-Kanade search window, in downscaled pixels
+    },
+    'tracking': {
+        'max_distance': 50,  # Pixels between box centres beyond which a box never continues a track
+        'iou_weight': 0.5,   # Weight of box overlap against centre distance when assigning boxes to tracks
+        'max_age': 2.0       # Seconds without a matching box before an unfinalized track is dropped
+    },
+    'residue': {
+        'frame_map': False, # Build one residue mask per frame (see ResidueMap) instead of one per box
+        'map_scale': 0.5,   # Resolution of the frame map relative to the frame
+        'coverage_cell': 32, # Frame pixels per side of a cell in the residue coverage heat-map
+        # HSV ranges (OpenCV scale: H 0-179) and the weight each adds to a pixel's residue mask value
+        'profiles': {
+            'residue': {'lower': [5, 50, 50], 'upper': [25, 255, 200], 'weight': 1.0},
+            'margin': {'lower': [5, 42, 42], 'upper': [25, 255, 200], 'weight': 0.3}
+        }
+    },
+    'recording': {
+        'path': None,       # Session directory; recording is off when unset
+        'encoding': 'jpeg', # jpeg | raw
+        'jpeg_quality': 90,
+        'chunk_size_mb': 256
+    }
+}
+
+_config = None
+
+
+def _merge(base, override):
+    """Recursively merge override into a copy of base"""
+    merged = copy.deepcopy(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def parse_source_spec(spec):
+    """Parse a CLI source spec such as 'camera:0', 'video:belt.mp4', 'images:frames/', 'replay:session/' or 'synthetic'"""
+    source_type, _, path = str(spec).partition(':')
+    source_type = source_type.strip().lower()
+    if source_type not in ('camera', 'video', 'images', 'synthetic', 'replay'):
+        raise ValueError(f"Unknown frame source type '{source_type}'")
+    source = {'type': source_type}
+    if path:
+        source['path'] = int(path) if source_type == 'camera' and path.isdigit() else path
+    elif source_type == 'camera':
+        source['path'] = 0
+    return source
+
+
+def load_config(path=None, overrides=None):
+    """Load config.yaml (if present) on top of the defaults and make it the active config"""
+    global _config
+    path = Path(path or os.environ.get('ECOGRADE_CONFIG', DEFAULT_CONFIG_PATH))
+    file_config = {}
+    if path.exists():
+        with open(path, 'r') as f:
+            file_config = yaml.safe_load(f) or {}
+    _config = _merge(_merge(DEFAULT_CONFIG, file_config), overrides)
+    return _config
+
+
+def get_config():
+    """Return the active config, loading it on first use"""
+    if _config is None:
+        load_config()
+    return _config
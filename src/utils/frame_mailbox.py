@@ -0,0 +1,143 @@
+import threading
+import time
+
+
+class CapturedFrame:
+    """A captured frame together with its capture timestamp and sequence number"""
+    __slots__ = ('image', 'seq', 'timestamp', 'lease', 'detect')
+
+    def __init__(self, image, seq, timestamp, lease=None, detect=True):
+        self.image = image
+        self.seq = seq
+        self.timestamp = timestamp  # time.monotonic() at capture
+        self.lease = lease  # BufferLease backing image, if it came from a pool
+        self.detect = detect  # False for frames that only advance the tracks between inference frames
+
+    def release(self):
+        """Return the frame buffer to its pool"""
+        if self.lease is not None:
+            self.lease.release()
+            self.lease = None
+
+    def age(self, now=None):
+        """Seconds elapsed since the frame was captured"""
+        if now is None:
+            now = time.monotonic()
+        return now - self.timestamp
+
+
+class FrameMailbox:
+    """Single-slot mailbox that always holds the most recently captured frame.
+
+    Unlike a bounded queue, putting a frame never blocks and never drops the
+    newest frame: it overwrites whatever the consumer has not taken yet, so the
+    processing thread always works on the freshest frame available. Consumers
+    block in wait() and are woken as soon as a frame arrives or the mailbox is
+    closed, so neither side has to poll.
+
+    Frames put with detect=False (inter-frame tracking only) never replace
+    a pending detect frame; they are dropped instead, so tracking cannot
+    starve inference.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame_ready = threading.Condition(self._lock)
+        self._slot_empty = threading.Condition(self._lock)
+        self._frame = None
+        self._seq = 0
+        self._closed = False
+        self.frames_captured = 0
+        self.frames_overwritten = 0
+        self.frames_taken = 0
+
+    def put(self, image, timestamp=None, lease=None, detect=True):
+        """Store a new frame, replacing (and releasing) any frame that was not taken yet"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self._lock:
+            self._seq += 1
+            self.frames_captured += 1
+            seq = self._seq
+            frame = CapturedFrame(image, seq, timestamp, lease, detect)
+            discarded = self._frame
+            if discarded is not None:
+                self.frames_overwritten += 1
+                if discarded.detect and not detect:
+                    discarded, frame = frame, discarded  # Keep the pending detect frame instead
+            self._frame = frame
+            self._frame_ready.notify()
+        if discarded is not None:
+            discarded.release()
+        return seq
+
+    def take(self):
+        """Take the latest frame and empty the slot. Returns None if there is none"""
+        with self._lock:
+            frame = self._frame
+            self._frame = None
+            if frame is not None:
+                self.frames_taken += 1
+                self._slot_empty.notify_all()
+            return frame
+
+    def wait(self, timeout=None):
+        """Block until a frame is available and take it.
+
+        Returns None if the timeout expires or the mailbox is closed.
+        """
+        with self._lock:
+            if not self._frame_ready.wait_for(lambda: self._frame is not None or self._closed, timeout):
+                return None
+            frame = self._frame
+            self._frame = None
+            if frame is not None:
+                self.frames_taken += 1
+                self._slot_empty.notify_all()
+            return frame
+
+    def wait_until_empty(self, timeout=None):
+        """Block until the pending frame has been taken, for lossless playback.
+
+        Returns False if the timeout expires or the mailbox is closed.
+        """
+        with self._lock:
+            self._slot_empty.wait_for(lambda: self._frame is None or self._closed, timeout)
+            return self._frame is None and not self._closed
+
+    def open(self):
+        """Re-open the mailbox after close()"""
+        with self._lock:
+            self._closed = False
+
+    def close(self):
+        """Discard the pending frame and wake every waiting consumer"""
+        with self._lock:
+            self._closed = True
+            pending, self._frame = self._frame, None
+            self._frame_ready.notify_all()
+            self._slot_empty.notify_all()
+        if pending is not None:
+            pending.release()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def clear(self):
+        """Discard the pending frame, if any"""
+        with self._lock:
+            pending, self._frame = self._frame, None
+            self._slot_empty.notify_all()
+        if pending is not None:
+            pending.release()
+
+    def get_stats(self):
+        """Return capture counters for monitoring"""
+        with self._lock:
+            return {
+                'captured': self.frames_captured,
+                'overwritten': self.frames_overwritten,
+                'taken': self.frames_taken,
+                'last_seq': self._seq
+            }
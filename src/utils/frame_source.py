@@ -0,0 +1,417 @@
+import cv2
+import numpy as np
+import time
+from pathlib import Path
+from src.utils.session_recording import SessionReader
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def _into(frame, image):
+    """Copy frame into image when the caller supplied a matching buffer"""
+    if frame is None or image is None or image.shape != frame.shape or image.dtype != frame.dtype:
+        return frame
+    np.copyto(image, frame)
+    return image
+
+
+class FramePacer:
+    """Sleeps so that frames are delivered at a fixed rate"""
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0
+        self.next_time = None
+
+    def wait(self):
+        if self.interval <= 0:
+            return
+        now = time.monotonic()
+        if self.next_time is None or now - self.next_time > 1.0:
+            # First frame, or we fell far behind: restart the schedule
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.interval
+
+
+class FrameSource:
+    """Base class for everything the pipeline can pull frames from.
+
+    The method names mirror cv2.VideoCapture so a source can be used anywhere
+    the pipeline previously used the camera directly.
+    """
+    name = 'source'
+
+    def __init__(self):
+        self.finished = False  # True once a finite source has no more frames
+        # Lossless sources wait for the pipeline to take each frame instead of
+        # having it overwritten, so every run processes exactly the same frames
+        self.lossless = False
+        self._grabbed = None
+
+    def open(self):
+        """Open the source. Raises an exception if it cannot be opened"""
+        return True
+
+    def isOpened(self):
+        return True
+
+    def read(self, image=None):
+        """Return (ret, frame) like cv2.VideoCapture.read.
+
+        If image is given and matches the frame size, the frame is written
+        into it instead of a newly allocated array.
+        """
+        raise NotImplementedError
+
+    def grab(self):
+        """Advance to the next frame without decoding it, if the source allows that"""
+        self._grabbed = self.read()
+        return self._grabbed[0]
+
+    def retrieve(self, image=None):
+        """Decode the frame selected by the last grab()"""
+        grabbed, self._grabbed = self._grabbed, None
+        if grabbed is None:
+            return False, None
+        return grabbed[0], _into(grabbed[1], image)
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        return 0
+
+    def release(self):
+        pass
+
+    def describe(self):
+        return self.name
+
+
+class CameraSource(FrameSource):
+    """Live camera attached through OpenCV"""
+    name = 'camera'
+
+    def __init__(self, index=0, width=640, height=480, fps=30):
+        super().__init__()
+        self.index = index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.cap = None
+
+    def open(self):
+        print(f"Trying to connect to camera index {self.index}...")
+        self.cap = cv2.VideoCapture(self.index)
+        if not self.cap.isOpened():
+            raise Exception(f"Could not connect to camera at index {self.index}. Please check your camera connection.")
+        try:
+            # Set optimized resolution for Raspberry Pi
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 1)
+            self.cap.set(cv2.CAP_PROP_EXPOSURE, -6)
+            self.cap.set(cv2.CAP_PROP_GAIN, 100)
+            actual_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+            actual_height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+            print(f"Camera resolution set to: {actual_width}x{actual_height}")
+        except Exception as e:
+            print(f"Warning: Could not set all camera properties: {str(e)}")
+        return True
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self, image=None):
+        return self.cap.read(image)
+
+    def grab(self):
+        return self.cap.grab()
+
+    def retrieve(self, image=None):
+        return self.cap.retrieve(image)
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        return f"camera:{self.index}"
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video file, played at its own frame rate or as fast as possible"""
+    name = 'video'
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = str(path)
+        self.realtime = realtime
+        self.loop = loop
+        self.lossless = not realtime
+        self.cap = None
+        self.pacer = None
+
+    def open(self):
+        if not Path(self.path).exists():
+            raise Exception(f"Video file not found: {self.path}")
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            raise Exception(f"Could not open video file: {self.path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.pacer = FramePacer(fps if self.realtime else 0)
+        self.finished = False
+        return True
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.cap.retrieve(image)
+
+    def grab(self):
+        self.pacer.wait()
+        ret = self.cap.grab()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret = self.cap.grab()
+        if not ret:
+            self.finished = True
+        return ret
+
+    def retrieve(self, image=None):
+        return self.cap.retrieve(image)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        return f"video:{self.path} ({'realtime' if self.realtime else 'max speed'})"
+
+
+class ImageFolderSource(FrameSource):
+    """Directory of still images played back in file name order"""
+    name = 'images'
+
+    def __init__(self, path, fps=30, realtime=True, loop=False, width=640, height=480):
+        super().__init__()
+        self.path = Path(path)
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.lossless = not realtime
+        self.size = (width, height)
+        self.files = []
+        self.position = 0
+        self.pacer = None
+
+    def open(self):
+        if not self.path.is_dir():
+            raise Exception(f"Image directory not found: {self.path}")
+        self.files = sorted(p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        if not self.files:
+            raise Exception(f"No images found in {self.path}")
+        self.position = 0
+        self.pacer = FramePacer(self.fps if self.realtime else 0)
+        self.finished = False
+        return True
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def grab(self):
+        if self.position >= len(self.files):
+            if not self.loop:
+                self.finished = True
+                return False
+            self.position = 0
+        self.pacer.wait()
+        self._grabbed = self.files[self.position]
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None):
+        # Files are only decoded for frames that are actually retrieved
+        path, self._grabbed = self._grabbed, None
+        if path is None:
+            return False, None
+        frame = cv2.imread(str(path))
+        if frame is None:
+            return False, None
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            if image is not None and image.shape == (self.size[1], self.size[0], 3):
+                return True, cv2.resize(frame, self.size, dst=image)
+            frame = cv2.resize(frame, self.size)
+        return True, _into(frame, image)
+
+    def describe(self):
+        return f"images:{self.path} ({len(self.files)} files)"
+
+
+class SyntheticSource(FrameSource):
+    """Generated frames of objects moving along a belt, for headless testing"""
+    name = 'synthetic'
+
+    def __init__(self, width=640, height=480, fps=30, realtime=True, num_frames=None, seed=0):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.realtime = realtime
+        self.lossless = not realtime
+        self.num_frames = num_frames
+        self.rng = np.random.default_rng(seed)
+        self.frame_index = 0
+        self.pacer = None
+        self.background = None
+
+    def open(self):
+        self.background = np.full((self.height, self.width, 3), (70, 70, 70), dtype=np.uint8)
+        noise = self.rng.integers(0, 12, size=self.background.shape, dtype=np.uint8)
+        self.background = cv2.add(self.background, noise)
+        self.frame_index = 0
+        self.pacer = FramePacer(self.fps if self.realtime else 0)
+        self.finished = False
+        return True
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def grab(self):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            self.finished = True
+            return False
+        self.pacer.wait()
+        self._grabbed = self.frame_index
+        self.frame_index += 1
+        return True
+
+    def retrieve(self, image=None):
+        frame_index, self._grabbed = self._grabbed, None
+        if frame_index is None:
+            return False, None
+        if image is not None and image.shape == self.background.shape:
+            frame = _into(self.background, image)
+        else:
+            frame = self.background.copy()
+        # One item crosses the belt every 90 frames, with a gap between items
+        period = 90
+        phase = frame_index % period
+        if phase < 60:
+            item_w, item_h = 160, 220
+            x = int((self.width + item_w) * phase / 60) - item_w
+            y = (self.height - item_h) // 2
+            cv2.rectangle(frame, (x, y), (x + item_w, y + item_h), (200, 180, 150), -1)
+            cv2.circle(frame, (x + item_w // 2, y + item_h // 2), 25, (40, 90, 150), -1)  # Residue stain
+        return True, frame
+
+    def describe(self):
+        return f"synthetic:{self.width}x{self.height}"
+
+
+class ReplaySource(FrameSource):
+    """Session recorded by SessionRecorder, replayed with its original timing or at max speed"""
+    name = 'replay'
+
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__()
+        self.path = Path(path)
+        self.realtime = realtime
+        self.loop = loop
+        self.lossless = not realtime
+        self.reader = None
+        self.position = 0
+        self.start_time = None
+
+    def open(self):
+        self.reader = SessionReader(self.path)
+        if len(self.reader) == 0:
+            raise Exception(f"Recorded session is empty: {self.path}")
+        self.position = 0
+        self.start_time = None
+        self.finished = False
+        return True
+
+    def read(self, image=None):
+        if not self.grab():
+            return False, None
+        return self.retrieve(image)
+
+    def grab(self):
+        if self.position >= len(self.reader):
+            if not self.loop:
+                self.finished = True
+                return False
+            self.position = 0
+            self.start_time = None
+        if self.realtime:
+            # Reproduce the recorded inter-frame timing
+            now = time.monotonic()
+            offset = self.reader.timestamp(self.position) - self.reader.timestamp(0)
+            if self.start_time is None:
+                self.start_time = now - offset
+            delay = self.start_time + offset - now
+            if delay > 0:
+                time.sleep(delay)
+        self._grabbed = self.position
+        self.position += 1
+        return True
+
+    def retrieve(self, image=None):
+        position, self._grabbed = self._grabbed, None
+        if position is None:
+            return False, None
+        return True, self.reader.read(position, image)
+
+    def release(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def describe(self):
+        count = len(self.reader) if self.reader is not None else 0
+        return f"replay:{self.path} ({count} frames, {'realtime' if self.realtime else 'max speed'})"
+
+
+def create_frame_source(source_config):
+    """Create a FrameSource from a 'source' config dict"""
+    source_type = source_config.get('type', 'camera')
+    width = source_config.get('width', 640)
+    height = source_config.get('height', 480)
+    fps = source_config.get('fps', 30)
+    realtime = source_config.get('realtime', True)
+    loop = source_config.get('loop', False)
+    path = source_config.get('path')
+
+    if source_type == 'camera':
+        return CameraSource(int(path or 0), width, height, fps)
+    if source_type == 'video':
+        return VideoFileSource(path, realtime=realtime, loop=loop)
+    if source_type == 'images':
+        return ImageFolderSource(path, fps=fps, realtime=realtime, loop=loop, width=width, height=height)
+    if source_type == 'synthetic':
+        return SyntheticSource(width, height, fps, realtime=realtime, num_frames=source_config.get('num_frames'))
+    if source_type == 'replay':
+        return ReplaySource(path, realtime=realtime, loop=loop)
+    raise ValueError(f"Unknown frame source type '{source_type}'")
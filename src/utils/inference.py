@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.utils.model_registry import model_registry
+from src.utils.threading_plan import pin_current_thread
+
+
+def detections_array(results):
+    """(N, 6) float32 array of x1, y1, x2, y2, conf, cls from ultralytics Results"""
+    if not results or results[0].boxes is None or len(results[0].boxes) == 0:
+        return np.zeros((0, 6), dtype=np.float32)
+    return results[0].boxes.data.cpu().numpy().astype(np.float32, copy=False)
+
+
+def masks_array(results):
+    """(N, H, W) uint8 instance masks (255 on the object) in input tensor coordinates, or None.
+
+    Rows line up with detections_array(results). ultralytics only fills
+    result.masks for segmentation models.
+    """
+    if not results or results[0].masks is None:
+        return None
+    return (results[0].masks.data.cpu().numpy() > 0.5).astype(np.uint8) * 255
+
+
+class InferenceScheduler:
+    """Serializes inference on one shared model for any number of pipelines.
+
+    Each VideoProcessor submits its frame and waits for the result. Requests
+    from different cameras are run one at a time in arrival order, so several
+    belts can share a single copy of the model without running predict()
+    concurrently on it.
+
+    The scheduler is created as soon as the model is requested; predict()
+    waits until the registry has finished loading and warming it up.
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, model_entry):
+        self.model_entry = model_entry  # ModelEntry of an InferenceBackend
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference',
+                                           initializer=pin_current_thread, initargs=('inference',))
+        self.stats_lock = threading.Lock()
+        self.requests_by_pipeline = {}
+
+    @classmethod
+    def shared(cls, model_path='best.pt', backend='torch', imgsz=640, precision='fp32', warmup_shape=None,
+               task='detect'):
+        """Return the process-wide scheduler for a model, creating it on first use"""
+        key = (backend, str(model_path), imgsz, precision, task)
+        with cls._shared_lock:
+            scheduler = cls._shared.get(key)
+            if scheduler is None:
+                entry = model_registry.request(model_path, backend, imgsz, precision, warmup_shape, task)
+                scheduler = cls(entry)
+                cls._shared[key] = scheduler
+            return scheduler
+
+    @property
+    def model(self):
+        """The loaded InferenceBackend, waiting for it if it is still loading"""
+        return self.model_entry.wait()
+
+    @property
+    def is_ready(self):
+        return self.model_entry.is_ready
+
+    def predict(self, frame, pipeline=None, **kwargs):
+        """Run model.predict on the scheduler thread and wait for the results"""
+        model = self.model
+        with self.stats_lock:
+            self.requests_by_pipeline[pipeline] = self.requests_by_pipeline.get(pipeline, 0) + 1
+        return self.executor.submit(model.predict, frame, **kwargs).result()
+
+    def detect(self, frame, pipeline=None, masks=False, **kwargs):
+        """Run predict() and return the detections as an (N, 6) array.
+
+        With masks=True returns (detections, masks) where masks is the
+        masks_array() of the results (None for a detection model).
+        """
+        results = self.predict(frame, pipeline, **kwargs)
+        if masks:
+            return detections_array(results), masks_array(results)
+        return detections_array(results)
+
+    def get_stats(self):
+        """Return how many inference requests each pipeline has made"""
+        with self.stats_lock:
+            return dict(self.requests_by_pipeline)
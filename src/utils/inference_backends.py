@@ -0,0 +1,189 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+
+class InferenceBackend:
+    """Runs a YOLO detector on CPU with one particular runtime.
+
+    predict() has the same signature and returns the same ultralytics Results
+    as YOLO.predict, so the pipeline does not care which runtime is in use.
+    """
+    name = 'backend'
+    export_format = None
+    dynamic_input = False  # True if the model accepts any input size that is a multiple of the stride
+
+    def __init__(self, model_path, imgsz=640, task='detect'):
+        self.model_path = str(model_path)
+        self.imgsz = imgsz
+        self.task = task  # 'detect' or 'segment'; exported models do not reliably carry it
+        self.model = None
+
+    def load(self):
+        raise NotImplementedError
+
+    def predict(self, source, **kwargs):
+        kwargs.setdefault('imgsz', self.imgsz)
+        kwargs.setdefault('verbose', False)
+        if isinstance(source, np.ndarray) and source.ndim == 4:
+            # Already letterboxed and normalized (see preprocess.TensorLetterbox); ultralytics uses tensors as is
+            source = torch.from_numpy(source)
+        return self.model.predict(source, **kwargs)
+
+    @property
+    def names(self):
+        return self.model.names
+
+    def describe(self):
+        return f"{self.name}:{self.model_path}"
+
+
+class TorchBackend(InferenceBackend):
+    """PyTorch eager execution of the .pt weights"""
+    name = 'torch'
+    dynamic_input = True
+
+    def load(self):
+        self.model = YOLO(self.model_path, verbose=False)
+        self.model.to('cpu')  # Force CPU usage
+        return self
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """ONNX export run by ONNX Runtime's CPU execution provider"""
+    name = 'onnxruntime'
+    export_format = 'onnx'
+
+    def load(self):
+        self.model = YOLO(self.model_path, task=self.task, verbose=False)
+        return self
+
+
+class OpenVinoBackend(InferenceBackend):
+    """OpenVINO IR export run on the CPU plugin"""
+    name = 'openvino'
+    export_format = 'openvino'
+
+    def load(self):
+        self.model = YOLO(self.model_path, task=self.task, verbose=False)
+        return self
+
+
+BACKENDS = {
+    'torch': TorchBackend,
+    'onnxruntime': OnnxRuntimeBackend,
+    'openvino': OpenVinoBackend
+}
+
+
+def resolve_model_path(weights, backend, precision='fp32'):
+    """Path of the model file a backend loads for the given .pt weights"""
+    weights = Path(weights)
+    if weights.suffix != '.pt':
+        return str(weights)
+    stem = weights.stem if precision == 'fp32' else f"{weights.stem}_{precision}"
+    if backend == 'torch':
+        if precision != 'fp32':
+            raise ValueError("The torch backend only runs FP32 weights; use onnxruntime or openvino for INT8")
+        return str(weights)
+    if backend == 'onnxruntime':
+        return str(weights.with_name(f"{stem}.onnx"))
+    if backend == 'openvino':
+        return str(weights.parent / f"{stem}_openvino_model")
+    raise ValueError(f"Unknown inference backend '{backend}'")
+
+
+def create_backend(backend, model_path, imgsz=640, precision='fp32', task='detect'):
+    """Create and load an inference backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}'. Choose from {', '.join(BACKENDS)}")
+    path = resolve_model_path(model_path, backend, precision)
+    if not Path(path).exists():
+        script = 'export_model.py' if precision == 'fp32' else 'quantize_model.py'
+        raise Exception(f"Model for backend '{backend}' ({precision}) not found: {path}. "
+                        f"Run scripts/{script} --format {backend} first.")
+    return BACKENDS[backend](path, imgsz, task).load()
+
+
+def export_model(weights, backend, imgsz=640, **kwargs):
+    """Export .pt weights for a backend and return the exported model path"""
+    export_format = BACKENDS[backend].export_format
+    if export_format is None:
+        return str(weights)
+    model = YOLO(str(weights), verbose=False)
+    exported = model.export(format=export_format, imgsz=imgsz, device='cpu', **kwargs)
+    print(f"Exported {weights} to {exported}")
+    return str(exported)
+
+
+def box_iou(box, boxes):
+    """IoU of one xyxy box against an (N, 4) array of boxes"""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return intersection / np.maximum(area + areas - intersection, 1e-9)
+
+
+def match_detections(reference, candidate, iou_threshold=0.5):
+    """Greedily match two (N, 6) xyxy/conf/cls arrays by class and IoU.
+
+    Returns a list of (reference_index, candidate_index, iou) tuples.
+    """
+    matches = []
+    used = np.zeros(len(candidate), dtype=bool)
+    for i in np.argsort(-reference[:, 4]):
+        if len(candidate) == 0:
+            break
+        ious = box_iou(reference[i, :4], candidate[:, :4])
+        ious[used | (candidate[:, 5] != reference[i, 5])] = 0
+        j = int(np.argmax(ious))
+        if ious[j] >= iou_threshold:
+            used[j] = True
+            matches.append((int(i), j, float(ious[j])))
+    return matches
+
+
+def check_parity(reference, candidate, frames, conf=0.5, min_recall=0.95, min_precision=0.95, min_iou=0.85):
+    """Compare a candidate backend's detections against a reference backend on the same frames"""
+    ref_total = cand_total = matched = 0
+    ious = []
+    conf_diffs = []
+    ref_time = cand_time = 0.0
+    for frame in frames:
+        start = time.perf_counter()
+        ref = reference.predict(frame, conf=conf)[0].boxes.data.cpu().numpy()
+        ref_time += time.perf_counter() - start
+        start = time.perf_counter()
+        cand = candidate.predict(frame, conf=conf)[0].boxes.data.cpu().numpy()
+        cand_time += time.perf_counter() - start
+
+        matches = match_detections(ref, cand)
+        ref_total += len(ref)
+        cand_total += len(cand)
+        matched += len(matches)
+        for i, j, iou in matches:
+            ious.append(iou)
+            conf_diffs.append(abs(float(ref[i, 4]) - float(cand[j, 4])))
+
+    count = max(len(frames), 1)
+    report = {
+        'frames': len(frames),
+        'reference_detections': ref_total,
+        'candidate_detections': cand_total,
+        'recall': matched / ref_total if ref_total else 1.0,
+        'precision': matched / cand_total if cand_total else 1.0,
+        'mean_iou': float(np.mean(ious)) if ious else 1.0,
+        'max_confidence_diff': float(np.max(conf_diffs)) if conf_diffs else 0.0,
+        'reference_ms': ref_time / count * 1000,
+        'candidate_ms': cand_time / count * 1000
+    }
+    report['passed'] = (report['recall'] >= min_recall and report['precision'] >= min_precision
+                        and report['mean_iou'] >= min_iou)
+    return report
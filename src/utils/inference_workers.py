@@ -0,0 +1,258 @@
+import atexit
+import itertools
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from queue import Queue, Empty
+
+import numpy as np
+
+from src.utils.model_registry import ModelEntry, WARMING_UP
+from src.utils.threading_plan import get_threading_plan
+
+_STOP = None
+
+
+def _attach(segments, name):
+    """Map a shared memory segment created by the parent, reusing earlier mappings"""
+    segment = segments.get(name)
+    if segment is None:
+        segment = shared_memory.SharedMemory(name=name)
+        segments[name] = segment
+    return segment
+
+
+def _worker_main(worker_id, model_path, backend, imgsz, precision, task, threads, cores, warmup_shape, warmup_runs,
+                 requests, responses):
+    """Inference worker process: load the model once, then answer requests until told to stop"""
+    try:
+        if cores:
+            os.sched_setaffinity(0, cores)  # Before torch creates its thread pool, which inherits it
+        import torch
+        torch.set_num_threads(threads)
+        from src.utils.inference_backends import create_backend
+        from src.utils.inference import detections_array, masks_array
+        model = create_backend(backend, model_path, imgsz, precision, task)
+        frame = np.zeros((1, 3, warmup_shape[0], warmup_shape[1]), dtype=np.float32)
+        for _ in range(warmup_runs):
+            model.predict(frame, verbose=False)
+    except Exception as e:
+        responses.put(('failed', worker_id, str(e)))
+        return
+    responses.put(('ready', worker_id, None))
+
+    segments = {}
+    try:
+        while True:
+            request = requests.get()
+            if request is _STOP:
+                break
+            request_id, name, shape, dtype, masks, kwargs = request
+            try:
+                segment = _attach(segments, name)
+                frame = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+                results = model.predict(frame, **kwargs)
+                if masks:
+                    responses.put(('result', request_id, (detections_array(results), masks_array(results))))
+                else:
+                    responses.put(('result', request_id, detections_array(results)))
+            except Exception as e:
+                responses.put(('error', request_id, str(e)))
+            finally:
+                frame = None  # Drop the view before the segment can be closed
+    finally:
+        for segment in segments.values():
+            segment.close()
+
+
+class _Slot:
+    """A shared memory segment a frame is copied into for one request"""
+    __slots__ = ('segment',)
+
+    def __init__(self):
+        self.segment = None
+
+    def ensure(self, nbytes):
+        if self.segment is None or self.segment.size < nbytes:
+            self.free()
+            self.segment = shared_memory.SharedMemory(create=True, size=nbytes)
+        return self.segment
+
+    def free(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+
+class InferenceWorkerPool:
+    """Runs inference in separate worker processes instead of a thread.
+
+    Frames are copied into shared memory slots, so only the slot name, the
+    frame shape and the predict() options are pickled; workers send back the
+    (N, 6) detection array, and the instance masks when asked. Any idle
+    worker takes the next request, so two belts can run inference at the
+    same time on different cores. detect() has the same signature as
+    InferenceScheduler.detect().
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, model_path='best.pt', backend='torch', imgsz=640, precision='fp32', workers=2,
+                 threads_per_worker=0, warmup_shape=None, warmup_runs=3, request_timeout=30.0, task='detect'):
+        self.workers = workers
+        plan = get_threading_plan()
+        self.threads_per_worker = threads_per_worker or max(1, plan.inference_threads // workers)
+        self.request_timeout = request_timeout
+        self.model_entry = ModelEntry(model_path, backend, imgsz, precision, task)
+        self.stats_lock = threading.Lock()
+        self.requests_by_pipeline = {}
+
+        context = mp.get_context('spawn')  # Fork is unsafe with Qt and torch threads in the parent
+        self.requests = context.Queue()
+        self.responses = context.Queue()
+        self.slots = Queue()
+        self.all_slots = [_Slot() for _ in range(workers * 2)]
+        for slot in self.all_slots:
+            self.slots.put(slot)
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.request_ids = itertools.count()
+        self.workers_ready = 0
+        self.closed = False
+
+        warmup_shape = warmup_shape or (imgsz, imgsz)
+        self.processes = [
+            context.Process(target=_worker_main, name=f"inference-worker-{index}", daemon=True,
+                            args=(index, model_path, backend, imgsz, precision, task, self.threads_per_worker,
+                                  plan.worker_cores(index, workers) if plan.applied and plan.pin_threads else None,
+                                  warmup_shape, warmup_runs, self.requests, self.responses))
+            for index in range(workers)
+        ]
+        for process in self.processes:
+            process.start()
+        self.model_entry.state = WARMING_UP
+        self.collector = threading.Thread(target=self._collect, name='inference-collector', daemon=True)
+        self.collector.start()
+
+    @classmethod
+    def shared(cls, model_path='best.pt', backend='torch', imgsz=640, precision='fp32', **kwargs):
+        """Return the process-wide worker pool for a model, starting it on first use"""
+        key = (backend, str(model_path), imgsz, precision, kwargs.get('task', 'detect'))
+        with cls._shared_lock:
+            pool = cls._shared.get(key)
+            if pool is None:
+                pool = cls(model_path, backend, imgsz, precision, **kwargs)
+                cls._shared[key] = pool
+                atexit.register(pool.close)
+            return pool
+
+    @property
+    def model(self):
+        """The pool itself once every worker has loaded the model"""
+        return self.model_entry.wait()
+
+    @property
+    def is_ready(self):
+        return self.model_entry.is_ready
+
+    def describe(self):
+        return (f"{self.model_entry.backend}:{self.model_entry.model_path} in {self.workers} worker processes "
+                f"({self.threads_per_worker} threads each)")
+
+    def _collect(self):
+        """Route worker responses to the waiting detect() calls"""
+        while True:
+            try:
+                kind, key, payload = self.responses.get(timeout=1.0)
+            except Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                break
+            if kind == 'ready':
+                self.workers_ready += 1
+                if self.workers_ready == self.workers:
+                    self.model_entry.set_ready(self)
+                    print(f"Inference workers ready: {self.describe()}")
+            elif kind == 'failed':
+                if not self.model_entry.done:
+                    self.model_entry.set_failed(f"worker {key}: {payload}")
+                    print(f"Error loading model: {self.model_entry.error}")
+            elif kind == 'stopped':
+                break
+            else:
+                with self.pending_lock:
+                    future = self.pending.pop(key, None)
+                if future is None:
+                    continue
+                if kind == 'result':
+                    future.set_result(payload)
+                else:
+                    future.set_exception(Exception(f"Inference worker error: {payload}"))
+
+    def _check_workers(self):
+        """Fail the pool instead of waiting forever if a worker process died"""
+        if self.closed:
+            return
+        dead = [process for process in self.processes if not process.is_alive()]
+        if not dead:
+            return
+        error = f"{dead[0].name} exited with code {dead[0].exitcode}"
+        if not self.model_entry.done:
+            self.model_entry.set_failed(error)
+            print(f"Error loading model: {error}")
+        with self.pending_lock:
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            future.set_exception(Exception(f"Inference worker error: {error}"))
+
+    def detect(self, frame, pipeline=None, masks=False, **kwargs):
+        """Run inference on a worker and return the detections as an (N, 6) array, or (detections, masks)"""
+        self.model_entry.wait()
+        if self.closed:
+            raise Exception("Inference worker pool is closed")
+        with self.stats_lock:
+            self.requests_by_pipeline[pipeline] = self.requests_by_pipeline.get(pipeline, 0) + 1
+
+        slot = self.slots.get()
+        try:
+            frame = np.ascontiguousarray(frame)
+            segment = slot.ensure(frame.nbytes)
+            np.copyto(np.ndarray(frame.shape, dtype=frame.dtype, buffer=segment.buf), frame)
+            future = Future()
+            request_id = next(self.request_ids)
+            with self.pending_lock:
+                self.pending[request_id] = future
+            kwargs.setdefault('verbose', False)
+            self.requests.put((request_id, segment.name, frame.shape, frame.dtype.str, masks, kwargs))
+            try:
+                return future.result(timeout=self.request_timeout)
+            finally:
+                with self.pending_lock:
+                    self.pending.pop(request_id, None)
+        finally:
+            self.slots.put(slot)
+
+    def get_stats(self):
+        """Return how many inference requests each pipeline has made"""
+        with self.stats_lock:
+            return dict(self.requests_by_pipeline)
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.processes:
+            self.requests.put(_STOP)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.responses.put(('stopped', None, None))
+        self.collector.join(timeout=1)
+        for slot in self.all_slots:
+            slot.free()
@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+
+
+class FlowTracker:
+    """Moves the last detected boxes along with the image on frames that skip inference.
+
+    After each inference frame, reset() picks corner features inside every
+    detected box on a downscaled grayscale copy of the frame. update()
+    follows the features into the next frame with pyramidal Lucas-Kanade
+    optical flow and shifts each box by the median motion of its features.
+    A box is dropped once fewer than min_points of its features are still
+    followed; the next inference frame starts over from the detections.
+    """
+
+    def __init__(self, scale=0.5, max_points=20, min_points=4, win_size=15, enabled=False):
+        self.scale = scale
+        self.max_points = max_points  # Features picked per box
+        self.min_points = min_points
+        self.win_size = (win_size, win_size)
+        self.enabled = enabled
+        self.prev = None  # Downscaled grayscale of the last frame seen
+        self.points = np.zeros((0, 1, 2), dtype=np.float32)  # Followed features, downscaled coordinates
+        self.owners = np.zeros(0, dtype=np.intp)  # Index into keys/boxes of each feature's box
+        self.keys = []
+        self.boxes = np.zeros((0, 4), dtype=np.float32)  # Downscaled x1, y1, x2, y2
+        self.frames_tracked = 0
+        self.boxes_lost = 0
+
+    @classmethod
+    def from_config(cls, interframe_config):
+        return cls(scale=interframe_config['scale'],
+                   max_points=interframe_config['max_points'],
+                   min_points=interframe_config['min_points'],
+                   win_size=interframe_config['win_size'],
+                   enabled=interframe_config['enabled'])
+
+    def _gray(self, image):
+        small = cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def reset(self, image, boxes):
+        """Start following boxes, a list of (key, (x1, y1, x2, y2)) in image coordinates"""
+        self.prev = self._gray(image)
+        h, w = self.prev.shape
+        points, owners, keys, kept = [], [], [], []
+        for key, box in boxes:
+            x1, y1, x2, y2 = (int(round(v * self.scale)) for v in box)
+            x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                continue
+            corners = cv2.goodFeaturesToTrack(self.prev[y1:y2, x1:x2], self.max_points, 0.01, 3)
+            if corners is None or len(corners) < self.min_points:
+                continue
+            corners += np.array([x1, y1], dtype=np.float32)
+            points.append(corners)
+            owners.append(np.full(len(corners), len(keys), dtype=np.intp))
+            keys.append(key)
+            kept.append((x1, y1, x2, y2))
+        self.keys = keys
+        self.boxes = np.array(kept, dtype=np.float32).reshape(-1, 4)
+        if points:
+            self.points = np.concatenate(points).astype(np.float32)
+            self.owners = np.concatenate(owners)
+        else:
+            self.points = np.zeros((0, 1, 2), dtype=np.float32)
+            self.owners = np.zeros(0, dtype=np.intp)
+
+    def update(self, image):
+        """Follow the boxes into image; returns the (key, (x1, y1, x2, y2)) still tracked, in image coordinates"""
+        gray = self._gray(image)
+        if self.prev is None or len(self.points) == 0 or gray.shape != self.prev.shape:
+            self.prev = gray
+            return []
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(self.prev, gray, self.points, None,
+                                                    winSize=self.win_size, maxLevel=2)
+        self.prev = gray
+        self.frames_tracked += 1
+        found = status.ravel() == 1
+        motion = (moved - self.points).reshape(-1, 2)
+
+        keep_boxes = []
+        for index in range(len(self.keys)):
+            followed = found & (self.owners == index)
+            if np.count_nonzero(followed) < self.min_points:
+                self.boxes_lost += 1
+                continue
+            dx, dy = np.median(motion[followed], axis=0)
+            self.boxes[index] += (dx, dy, dx, dy)
+            keep_boxes.append(index)
+
+        # Keep only the features that were found and whose box is still tracked
+        remap = np.full(len(self.keys), -1, dtype=np.intp)
+        remap[keep_boxes] = np.arange(len(keep_boxes))
+        keep = found & (remap[self.owners] >= 0)
+        self.points = moved[keep]
+        self.owners = remap[self.owners[keep]]
+        self.keys = [self.keys[index] for index in keep_boxes]
+        self.boxes = self.boxes[keep_boxes]
+
+        h, w = image.shape[:2]
+        tracked = []
+        for key, box in zip(self.keys, self.boxes / self.scale):
+            x1, y1, x2, y2 = (int(round(v)) for v in box)
+            tracked.append((key, (max(0, x1), max(0, y1), min(w, x2), min(h, y2))))
+        return tracked
+
+    def get_stats(self):
+        return {'frames_tracked': self.frames_tracked, 'boxes': len(self.keys), 'boxes_lost': self.boxes_lost}
@@ -0,0 +1,137 @@
+import threading
+import time
+import numpy as np
+from src.utils.inference_backends import create_backend
+from src.utils.config import get_config
+from src.utils.threading_plan import pin_current_thread
+
+LOADING = 'loading'
+WARMING_UP = 'warming_up'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class ModelEntry:
+    """One model being loaded, warmed up or ready for use.
+
+    Loading and warmup run on a background thread. Callers that need the
+    model call wait(), which blocks until it is ready and re-raises the load
+    error if it failed; the UI only polls state without blocking.
+    """
+
+    def __init__(self, model_path, backend, imgsz, precision, task='detect'):
+        self.model_path = model_path
+        self.backend = backend
+        self.imgsz = imgsz
+        self.precision = precision
+        self.task = task
+        self.state = LOADING
+        self.model = None
+        self.error = None
+        self.load_time = 0.0
+        self.warmup_time = 0.0
+        self._ready = threading.Event()
+
+    @property
+    def is_ready(self):
+        return self.state == READY
+
+    @property
+    def done(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the model is ready and return it"""
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"Model {self.model_path} ({self.backend}) is still {self.state}")
+        if self.state == FAILED:
+            raise Exception(f"Failed to load YOLO model: {self.error}")
+        return self.model
+
+    def set_ready(self, model):
+        self.model = model
+        self.state = READY
+        self._ready.set()
+
+    def set_failed(self, error):
+        self.error = str(error)
+        self.state = FAILED
+        self._ready.set()
+
+    def describe(self):
+        if self.state == READY:
+            return f"{self.model.describe()} (loaded in {self.load_time:.1f} s, warmup {self.warmup_time:.1f} s)"
+        if self.state == FAILED:
+            return f"{self.backend}:{self.model_path} failed: {self.error}"
+        return f"{self.backend}:{self.model_path} {self.state.replace('_', ' ')}"
+
+
+class ModelRegistry:
+    """Loads every model once per process, off the caller's thread.
+
+    request() returns immediately with a ModelEntry; the first request for a
+    model starts a background thread that loads it and runs a few warmup
+    inferences, so the first real frame does not pay for lazy initialisation
+    inside the runtime.
+    """
+
+    def __init__(self, warmup_runs=None):
+        self.warmup_runs = warmup_runs  # None uses inference.warmup_runs from the config
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def request(self, model_path='best.pt', backend='torch', imgsz=640, precision='fp32', warmup_shape=None,
+                task='detect'):
+        """Start loading a model if needed and return its entry without waiting.
+
+        warmup_shape is the (height, width) of the input tensors the pipeline
+        will pass to predict(); it defaults to a square imgsz input.
+        """
+        key = (backend, str(model_path), imgsz, precision, task)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = ModelEntry(model_path, backend, imgsz, precision, task)
+                self._entries[key] = entry
+                thread = threading.Thread(target=self._load, args=(entry, warmup_shape or (imgsz, imgsz)),
+                                          name='model-loader', daemon=True)
+                thread.start()
+            return entry
+
+    def _load(self, entry, warmup_shape):
+        pin_current_thread('inference')  # Torch's thread pool, created during warmup, inherits these cores
+        try:
+            start = time.perf_counter()
+            model = create_backend(entry.backend, entry.model_path, entry.imgsz, entry.precision, entry.task)
+            entry.load_time = time.perf_counter() - start
+
+            entry.state = WARMING_UP
+            start = time.perf_counter()
+            frame = np.zeros((1, 3, warmup_shape[0], warmup_shape[1]), dtype=np.float32)
+            runs = self.warmup_runs if self.warmup_runs is not None else get_config()['inference']['warmup_runs']
+            for _ in range(runs):
+                model.predict(frame, verbose=False)
+            entry.warmup_time = time.perf_counter() - start
+
+            entry.set_ready(model)
+            print(f"Model loaded successfully: {entry.describe()}")
+        except Exception as e:
+            entry.set_failed(e)
+            print(f"Error loading model: {entry.error}")
+
+    def get(self, model_path='best.pt', backend='torch', imgsz=640, precision='fp32', timeout=None):
+        """Return a loaded model, waiting for it to finish loading"""
+        return self.request(model_path, backend, imgsz, precision).wait(timeout)
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries.values())
+
+
+# Global instance
+model_registry = ModelRegistry()
+
+
+def get_model(model_path='best.pt', backend='torch', imgsz=640, precision='fp32'):
+    """Load a model once per process for a backend and return the shared instance"""
+    return model_registry.get(model_path, backend, imgsz, precision)
@@ -0,0 +1,123 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Decides whether anything is on the belt by comparing against a background model.
+
+    Frames are reduced to a small blurred grayscale image and compared with
+    a running-average background. While fewer than min_changed_fraction of
+    the pixels differ the belt counts as empty and the pipeline skips
+    inference; the gate re-arms on the first frame with enough change and
+    stays armed for hold_frames after the change disappears.
+
+    The background is re-learned continuously: at learning_rate while the
+    belt is empty, and much more slowly while it is occupied, so lighting
+    drift is absorbed but an item passing through is not.
+    """
+
+    def __init__(self, size=(160, 120), threshold=25, min_changed_fraction=0.01, learning_rate=0.02,
+                 occupied_learning_rate=0.001, hold_frames=3, enabled=True):
+        self.size = tuple(size)  # Width, height of the comparison image
+        self.threshold = threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.learning_rate = learning_rate
+        self.occupied_learning_rate = occupied_learning_rate
+        self.hold_frames = hold_frames
+        self.enabled = enabled
+        self.background = None  # float32 running average
+        self.changed = None  # uint8 mask of changed pixels from the last update()
+        self.changed_fraction = 0.0
+        self.occupied = True
+        self.hold = 0
+        self.frames_checked = 0
+        self.frames_gated = 0
+        self._gray = np.empty(self.size[::-1], dtype=np.uint8)
+        self._diff = np.empty(self.size[::-1], dtype=np.uint8)
+        self._kernel = np.ones((3, 3), dtype=np.uint8)
+
+    @classmethod
+    def from_config(cls, gate_config):
+        return cls(size=gate_config['size'],
+                   threshold=gate_config['threshold'],
+                   min_changed_fraction=gate_config['min_changed_fraction'],
+                   learning_rate=gate_config['learning_rate'],
+                   occupied_learning_rate=gate_config['occupied_learning_rate'],
+                   hold_frames=gate_config['hold_frames'],
+                   enabled=gate_config['enabled'])
+
+    def _prepare(self, frame):
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        else:
+            np.copyto(self._gray, small)
+        cv2.GaussianBlur(self._gray, (5, 5), 0, dst=self._gray)
+        return self._gray
+
+    def seed(self, frame):
+        """Use frame, taken with the belt empty, as the initial background"""
+        self.background = self._prepare(frame).astype(np.float32)
+        self.occupied = False
+        self.hold = 0
+
+    def update(self, frame):
+        """Compare frame with the background, learn from it, and return True if the belt is occupied"""
+        if not self.enabled:
+            return True
+        gray = self._prepare(frame)
+        if self.background is None:
+            self.seed(frame)
+            return True
+        self.frames_checked += 1
+
+        cv2.absdiff(gray, cv2.convertScaleAbs(self.background), dst=self._diff)
+        _, self.changed = cv2.threshold(self._diff, self.threshold, 255, cv2.THRESH_BINARY)
+        self.changed_fraction = cv2.countNonZero(self.changed) / self.changed.size
+
+        if self.changed_fraction >= self.min_changed_fraction:
+            self.occupied = True
+            self.hold = self.hold_frames
+        elif self.hold > 0:
+            self.hold -= 1
+        else:
+            self.occupied = False
+
+        rate = self.occupied_learning_rate if self.occupied else self.learning_rate
+        cv2.accumulateWeighted(gray, self.background, rate)
+        if not self.occupied:
+            self.frames_gated += 1
+        return self.occupied
+
+    def changed_region(self, frame_shape, margin=32, min_size=160):
+        """Bounding box (x1, y1, x2, y2) of the changed pixels in frame coordinates, or None.
+
+        The box is grown by margin pixels on every side and to at least
+        min_size pixels wide and high, then clipped to the frame.
+        """
+        if self.changed is None:
+            return None
+        # Drop isolated noisy pixels so they do not stretch the box to the whole frame
+        mask = cv2.morphologyEx(self.changed, cv2.MORPH_OPEN, self._kernel)
+        points = cv2.findNonZero(mask)
+        if points is None:
+            return None
+        x, y, w, h = cv2.boundingRect(points)
+        frame_h, frame_w = frame_shape[:2]
+        scale_x = frame_w / self.size[0]
+        scale_y = frame_h / self.size[1]
+        x1, x2 = x * scale_x - margin, (x + w) * scale_x + margin
+        y1, y2 = y * scale_y - margin, (y + h) * scale_y + margin
+        grow_x = max(0, min_size - (x2 - x1)) / 2
+        grow_y = max(0, min_size - (y2 - y1)) / 2
+        x1, x2 = max(0, int(x1 - grow_x)), min(frame_w, int(x2 + grow_x))
+        y1, y2 = max(0, int(y1 - grow_y)), min(frame_h, int(y2 + grow_y))
+        return x1, y1, x2, y2
+
+    def get_stats(self):
+        return {
+            'checked': self.frames_checked,
+            'gated': self.frames_gated,
+            'occupied': self.occupied,
+            'changed_fraction': self.changed_fraction
+        }
@@ -0,0 +1,114 @@
+import cv2
+import numpy as np
+
+# Model class id -> waste type shown to the operator and used for classification
+WASTE_TYPES = {
+    0: 'HDPE Plastic',
+    1: 'PP',
+    2: 'PET Bottle',
+    3: 'PP',
+    4: 'LDPE',
+    5: 'HDPE Plastic',
+    6: 'Tin Can',
+    7: 'UHT Box'
+}
+UNKNOWN_WASTE_TYPE = 'Unknown'
+_WASTE_TYPE_LUT = np.array([WASTE_TYPES.get(i, UNKNOWN_WASTE_TYPE) for i in range(max(WASTE_TYPES) + 2)],
+                           dtype=object)
+
+# One accepted detection, in frame pixel coordinates
+DETECTION_DTYPE = np.dtype([
+    ('x1', '<i4'),
+    ('y1', '<i4'),
+    ('x2', '<i4'),
+    ('y2', '<i4'),
+    ('cx', '<i4'),      # Centroid used for tracking
+    ('cy', '<i4'),
+    ('area', '<i4'),
+    ('conf', '<f4'),
+    ('cls', '<i2'),
+    ('typed', '?'),     # conf is high enough to trust the waste type
+    ('index', '<i4'),   # Row in the model's output, e.g. for InstanceMasks
+])
+
+
+def waste_type_names(cls_ids):
+    """Vectorised WASTE_TYPES lookup; unknown class ids map to 'Unknown'"""
+    cls_ids = np.asarray(cls_ids, dtype=np.int64)
+    index = np.where((cls_ids >= 0) & (cls_ids < len(_WASTE_TYPE_LUT) - 1), cls_ids, len(_WASTE_TYPE_LUT) - 1)
+    return _WASTE_TYPE_LUT[index]
+
+
+def filter_detections(detections, min_area, max_area, min_confidence=0.0, type_confidence=0.8):
+    """Convert (N, 6) x1, y1, x2, y2, conf, cls rows into a DETECTION_DTYPE array in one pass.
+
+    Coordinates are truncated to whole pixels, boxes outside the
+    [min_area, max_area] range or below min_confidence are dropped, and the
+    model's order (highest confidence first) is kept.
+    """
+    if len(detections) == 0:
+        return np.zeros(0, dtype=DETECTION_DTYPE)
+    boxes = detections[:, :4].astype(np.int32)
+    conf = detections[:, 4]
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    keep = (area >= min_area) & (area <= max_area) & (conf >= min_confidence)
+
+    boxes = boxes[keep]
+    result = np.empty(len(boxes), dtype=DETECTION_DTYPE)
+    result['x1'], result['y1'], result['x2'], result['y2'] = boxes.T
+    result['cx'] = (boxes[:, 0] + boxes[:, 2]) // 2
+    result['cy'] = (boxes[:, 1] + boxes[:, 3]) // 2
+    result['area'] = area[keep]
+    result['conf'] = conf[keep]
+    result['cls'] = detections[keep, 5].astype(np.int16)
+    result['typed'] = result['conf'] > type_confidence
+    result['index'] = np.flatnonzero(keep)
+    return result
+
+
+class InstanceMasks:
+    """Per-instance segmentation masks in frame coordinates, kept at reduced resolution.
+
+    The model's masks cover the letterboxed input tensor. from_letterboxed()
+    cuts off the padding and resizes each mask once to one cell per
+    downsample x downsample frame pixels; box_mask() then only has to
+    stretch the cells under one detection box to the box size.
+    """
+
+    def __init__(self, masks, origin, step):
+        self.masks = masks  # (N, h, w) uint8, 255 on object pixels
+        self.origin = origin  # Frame (x, y) of the top-left corner of mask cell (0, 0)
+        self.step = step  # Frame pixels (x, y) per mask cell
+
+    @classmethod
+    def from_letterboxed(cls, masks, scale, pad, region, frame_scale=(1.0, 1.0), downsample=2):
+        """Masks predicted on the frame region (x1, y1, x2, y2) letterboxed with scale and pad (left, top).
+
+        frame_scale maps region coordinates to the frame the boxes are
+        drawn on, as for the detection boxes.
+        """
+        x1, y1, x2, y2 = region
+        left, top = pad
+        inner_w = min(masks.shape[2] - left, max(1, round((x2 - x1) * scale)))
+        inner_h = min(masks.shape[1] - top, max(1, round((y2 - y1) * scale)))
+        cells_w = max(1, (x2 - x1) // downsample)
+        cells_h = max(1, (y2 - y1) // downsample)
+        small = np.empty((len(masks), cells_h, cells_w), dtype=np.uint8)
+        for mask, cells in zip(masks, small):
+            cv2.resize(mask[top:top + inner_h, left:left + inner_w], (cells_w, cells_h), dst=cells,
+                       interpolation=cv2.INTER_AREA)
+        cv2.threshold(small.reshape(-1, cells_w), 127, 255, cv2.THRESH_BINARY, dst=small.reshape(-1, cells_w))
+        sx, sy = frame_scale
+        return cls(small, (x1 * sx, y1 * sy), ((x2 - x1) / cells_w * sx, (y2 - y1) / cells_h * sy))
+
+    def box_mask(self, index, box):
+        """uint8 mask of instance index over box (x1, y1, x2, y2), shaped (y2 - y1, x2 - x1)"""
+        x1, y1, x2, y2 = box
+        cells = self.masks[index]
+        u1 = max(0, int((x1 - self.origin[0]) / self.step[0]))
+        v1 = max(0, int((y1 - self.origin[1]) / self.step[1]))
+        u2 = min(cells.shape[1], int(np.ceil((x2 - self.origin[0]) / self.step[0])))
+        v2 = min(cells.shape[0], int(np.ceil((y2 - self.origin[1]) / self.step[1])))
+        if u2 <= u1 or v2 <= v1:
+            return np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        return cv2.resize(cells[v1:v2, u1:u2], (x2 - x1, y2 - y1), interpolation=cv2.INTER_NEAREST)
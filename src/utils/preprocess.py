@@ -0,0 +1,109 @@
+import math
+
+import cv2
+import numpy as np
+
+
+def letterbox(image, new_shape=(640, 640), color=(114, 114, 114), dst=None):
+    """Resize image keeping its aspect ratio and pad it to new_shape (height, width).
+
+    Returns the padded image, the scale applied and the (left, top) padding,
+    which map model coordinates back with (x - left) / scale, (y - top) / scale.
+    If dst is given it must have shape new_shape + (3,) and is written in place.
+    """
+    height, width = image.shape[:2]
+    scale = min(new_shape[0] / height, new_shape[1] / width)
+    resized_w, resized_h = int(round(width * scale)), int(round(height * scale))
+    left = (new_shape[1] - resized_w) // 2
+    top = (new_shape[0] - resized_h) // 2
+    if dst is None:
+        dst = np.empty((new_shape[0], new_shape[1], 3), dtype=np.uint8)
+    if (resized_h, resized_w) == tuple(new_shape[:2]):
+        cv2.resize(image, (resized_w, resized_h), dst=dst, interpolation=cv2.INTER_LINEAR)
+    else:
+        dst[:] = color
+        dst[top:top + resized_h, left:left + resized_w] = cv2.resize(image, (resized_w, resized_h),
+                                                                     interpolation=cv2.INTER_LINEAR)
+    return dst, scale, (left, top)
+
+
+def unletterbox_boxes(detections, scale, pad, offset=(0, 0), shape=None):
+    """Map (N, 6) detections from letterboxed input back to the source frame.
+
+    offset is the (x, y) of the letterboxed region within the frame when only
+    part of the frame was sent to the model; boxes are clipped to shape
+    (height, width) when it is given.
+    """
+    if len(detections) == 0:
+        return detections
+    mapped = detections.copy()
+    mapped[:, [0, 2]] = (mapped[:, [0, 2]] - pad[0]) / scale + offset[0]
+    mapped[:, [1, 3]] = (mapped[:, [1, 3]] - pad[1]) / scale + offset[1]
+    if shape is not None:
+        np.clip(mapped[:, [0, 2]], 0, shape[1], out=mapped[:, [0, 2]])
+        np.clip(mapped[:, [1, 3]], 0, shape[0], out=mapped[:, [1, 3]])
+    return mapped
+
+
+def to_input_tensor(image):
+    """Convert a BGR uint8 image to a normalized 1x3xHxW RGB float32 array"""
+    tensor = image[:, :, ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return np.ascontiguousarray(tensor[np.newaxis])
+
+
+def model_input_shape(height, width, imgsz=640, dynamic=True, stride=32):
+    """(height, width) of the network input for an image of the given size.
+
+    Models with a fixed input size (ONNX and OpenVINO exports) always take
+    imgsz x imgsz. PyTorch models accept any multiple of the stride, so the
+    longer side is scaled to imgsz and the shorter side is rounded up,
+    which avoids running the network on padding.
+    """
+    if not dynamic:
+        return imgsz, imgsz
+    scale = imgsz / max(height, width)
+    return (int(math.ceil(height * scale / stride) * stride),
+            int(math.ceil(width * scale / stride) * stride))
+
+
+class TensorLetterbox:
+    """Letterboxes images straight into a reused, normalized 1x3xHxW RGB float32 tensor.
+
+    Each call does one resize and one BGR->RGB, HWC->CHW, /255 pass into the
+    tensor. The padding is only refilled when the letterbox geometry
+    changes. The returned tensor is overwritten by the next call.
+    """
+
+    def __init__(self, color=114):
+        self.color = color / 255.0
+        self.tensor = None
+        self._resized = None
+        self._geometry = None  # (top, left, height, width) of the image area the padding was filled for
+
+    def __call__(self, image, new_shape):
+        """Return the tensor, the scale applied and the (left, top) padding, as letterbox() does"""
+        height, width = image.shape[:2]
+        scale = min(new_shape[0] / height, new_shape[1] / width)
+        resized_w, resized_h = int(round(width * scale)), int(round(height * scale))
+        left = (new_shape[1] - resized_w) // 2
+        top = (new_shape[0] - resized_h) // 2
+
+        if self.tensor is None or self.tensor.shape[2:] != tuple(new_shape):
+            self.tensor = np.empty((1, 3, new_shape[0], new_shape[1]), dtype=np.float32)
+            self._geometry = None
+        geometry = (top, left, resized_h, resized_w)
+        if geometry != self._geometry:
+            self.tensor.fill(self.color)
+            self._geometry = geometry
+
+        if (resized_h, resized_w) == (height, width):
+            resized = image
+        else:
+            if self._resized is None or self._resized.shape[:2] != (resized_h, resized_w):
+                self._resized = np.empty((resized_h, resized_w, 3), dtype=np.uint8)
+            resized = cv2.resize(image, (resized_w, resized_h), dst=self._resized, interpolation=cv2.INTER_LINEAR)
+
+        area = self.tensor[0, :, top:top + resized_h, left:left + resized_w]
+        for channel in range(3):
+            np.multiply(resized[:, :, 2 - channel], np.float32(1 / 255.0), out=area[channel])
+        return self.tensor, scale, (left, top)
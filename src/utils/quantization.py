@@ -0,0 +1,193 @@
+import shutil
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.utils.inference_backends import match_detections
+from src.utils.preprocess import letterbox, to_input_tensor
+
+
+def calibration_tensors(frames, imgsz):
+    """Preprocess frames exactly like the exported model's input"""
+    return [to_input_tensor(letterbox(frame, (imgsz, imgsz))[0]) for frame in frames]
+
+
+def quantize_onnx(onnx_path, frames, output_path, imgsz=640):
+    """Statically quantize an ONNX model to INT8 using frames for calibration"""
+    import onnx
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                          quantize_static)
+
+    model = onnx.load(str(onnx_path))
+    input_name = model.graph.input[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.tensors = iter(calibration_tensors(frames, imgsz))
+
+        def get_next(self):
+            tensor = next(self.tensors, None)
+            return None if tensor is None else {input_name: tensor}
+
+    quantize_static(str(onnx_path), str(output_path), FrameReader(),
+                    quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8,
+                    per_channel=True)
+
+    # Keep the class names, stride and input size ultralytics reads from the model metadata
+    quantized = onnx.load(str(output_path))
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(model.metadata_props)
+    onnx.save(quantized, str(output_path))
+    print(f"INT8 ONNX model written to {output_path}")
+    return str(output_path)
+
+
+def quantize_openvino(model_dir, frames, output_dir, imgsz=640):
+    """Quantize an OpenVINO IR model to INT8 with NNCF using frames for calibration"""
+    import nncf
+    import openvino as ov
+
+    model_dir = Path(model_dir)
+    output_dir = Path(output_dir)
+    xml_path = next(model_dir.glob('*.xml'))
+    model = ov.Core().read_model(str(xml_path))
+    dataset = nncf.Dataset(calibration_tensors(frames, imgsz))
+    quantized = nncf.quantize(model, dataset, preset=nncf.QuantizationPreset.MIXED,
+                              subset_size=len(frames))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ov.save_model(quantized, str(output_dir / xml_path.name))
+    if (model_dir / 'metadata.yaml').exists():
+        shutil.copy(model_dir / 'metadata.yaml', output_dir / 'metadata.yaml')
+    print(f"INT8 OpenVINO model written to {output_dir}")
+    return str(output_dir)
+
+
+def load_labels(label_path, width, height):
+    """Read YOLO-format labels (cls cx cy w h, normalized) as an (N, 6) xyxy/conf/cls array"""
+    label_path = Path(label_path)
+    if not label_path.exists():
+        return None
+    rows = []
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        cls_id, cx, cy, w, h = int(parts[0]), *map(float, parts[1:5])
+        rows.append([(cx - w / 2) * width, (cy - h / 2) * height,
+                     (cx + w / 2) * width, (cy + h / 2) * height, 1.0, cls_id])
+    return np.array(rows, dtype=np.float32).reshape(-1, 6)
+
+
+def _class_counts(reference, candidate, matches, counts):
+    """Accumulate per-class true positive, false positive and false negative counts"""
+    matched_ref = {i for i, _, _ in matches}
+    matched_cand = {j for _, j, _ in matches}
+    for i, row in enumerate(reference):
+        entry = counts.setdefault(int(row[5]), [0, 0, 0])
+        if i in matched_ref:
+            entry[0] += 1
+        else:
+            entry[2] += 1
+    for j, row in enumerate(candidate):
+        if j not in matched_cand:
+            counts.setdefault(int(row[5]), [0, 0, 0])[1] += 1
+
+
+def _precision_recall(counts):
+    tp, fp, fn = counts
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def evaluate_quantized(fp32, int8, samples, conf=0.5):
+    """Compare FP32 and INT8 backends on (frame, labels) samples.
+
+    With ground-truth labels both models are scored against them. For frames
+    without labels, the FP32 detections are used as the reference for INT8.
+    """
+    fp32_counts, int8_counts = {}, {}
+    fp32_time = int8_time = 0.0
+    labelled = 0
+    for frame, labels in samples:
+        start = time.perf_counter()
+        fp32_boxes = fp32.predict(frame, conf=conf)[0].boxes.data.cpu().numpy()
+        fp32_time += time.perf_counter() - start
+        start = time.perf_counter()
+        int8_boxes = int8.predict(frame, conf=conf)[0].boxes.data.cpu().numpy()
+        int8_time += time.perf_counter() - start
+
+        if labels is not None:
+            labelled += 1
+            _class_counts(labels, fp32_boxes, match_detections(labels, fp32_boxes), fp32_counts)
+            reference = labels
+        else:
+            reference = fp32_boxes
+        _class_counts(reference, int8_boxes, match_detections(reference, int8_boxes), int8_counts)
+
+    names = fp32.names
+    classes = sorted(set(fp32_counts) | set(int8_counts))
+    count = max(len(samples), 1)
+    return {
+        'frames': len(samples),
+        'labelled_frames': labelled,
+        'fp32_ms': fp32_time / count * 1000,
+        'int8_ms': int8_time / count * 1000,
+        'classes': [{
+            'class': names.get(cls_id, str(cls_id)) if isinstance(names, dict) else str(cls_id),
+            'fp32': _precision_recall(fp32_counts[cls_id]) if cls_id in fp32_counts else None,
+            'int8': _precision_recall(int8_counts[cls_id]) if cls_id in int8_counts else None,
+        } for cls_id in classes]
+    }
+
+
+def format_report(report):
+    """Markdown accuracy-vs-speed report"""
+    lines = [
+        "# INT8 quantization report",
+        "",
+        f"Frames evaluated: {report['frames']} ({report['labelled_frames']} with ground-truth labels)",
+        "",
+        "| Model | Mean latency | Speed-up |",
+        "|---|---|---|",
+        f"| FP32 | {report['fp32_ms']:.1f} ms | 1.00x |",
+        f"| INT8 | {report['int8_ms']:.1f} ms | {report['fp32_ms'] / max(report['int8_ms'], 1e-9):.2f}x |",
+        "",
+        "| Class | FP32 precision | FP32 recall | INT8 precision | INT8 recall |",
+        "|---|---|---|---|---|",
+    ]
+    for row in report['classes']:
+        fp32 = f"{row['fp32'][0]:.3f} | {row['fp32'][1]:.3f}" if row['fp32'] else "- | -"
+        int8 = f"{row['int8'][0]:.3f} | {row['int8'][1]:.3f}" if row['int8'] else "- | -"
+        lines.append(f"| {row['class']} | {fp32} | {int8} |")
+    if report['labelled_frames'] < report['frames']:
+        lines += ["", "Frames without labels score INT8 against the FP32 detections, "
+                      "so FP32 precision and recall only cover labelled frames."]
+    return "\n".join(lines) + "\n"
+
+
+def load_samples(image_dir, limit=None):
+    """Load (frame, labels) pairs from a folder of images with optional YOLO .txt labels.
+
+    Labels are looked up next to each image and in a sibling 'labels' directory.
+    """
+    image_dir = Path(image_dir)
+    samples = []
+    for image_path in sorted(image_dir.iterdir()):
+        if image_path.suffix.lower() not in ('.jpg', '.jpeg', '.png', '.bmp'):
+            continue
+        frame = cv2.imread(str(image_path))
+        if frame is None:
+            continue
+        height, width = frame.shape[:2]
+        labels = load_labels(image_path.with_suffix('.txt'), width, height)
+        if labels is None:
+            labels = load_labels(image_dir.parent / 'labels' / f"{image_path.stem}.txt", width, height)
+        samples.append((frame, labels))
+        if limit and len(samples) >= limit:
+            break
+    return samples
@@ -0,0 +1,121 @@
+import math
+import time
+
+
+def _recent_mean(values, count):
+    recent = values[-count:]
+    return sum(recent) / len(recent) if recent else 0.0
+
+
+class RateController:
+    """Chooses how many captured frames to skip so results stay within a latency target.
+
+    The capture thread calls schedule() for every frame, before anything is
+    decoded or resized, and the processing thread calls update() after each
+    processed frame. update() reads the recent per-stage timings from the
+    pipeline's performance_metrics and, every adjust_interval seconds,
+    adjusts frame_skip:
+
+    - never below the skip at which scheduled frames arrive faster than they
+      can be processed (they would only be overwritten in the mailbox),
+    - up by one while capture-to-result latency is above the target because
+      frames wait to be processed,
+    - straight to that minimum skip when processing alone is over the
+      target, since skipping more frames cannot make a frame faster,
+    - down by one while latency is comfortably below the target, to use
+      spare CPU.
+
+    With adaptive=False frame_skip stays at its configured value.
+    """
+
+    def __init__(self, frame_skip=3, adaptive=True, target_latency_ms=200.0, min_frame_skip=1,
+                 max_frame_skip=15, adjust_interval=1.0, headroom=1.2, window=10):
+        self.frame_skip = frame_skip
+        self.adaptive = adaptive
+        self.target_latency_ms = target_latency_ms
+        self.min_frame_skip = min_frame_skip
+        self.max_frame_skip = max_frame_skip
+        self.adjust_interval = adjust_interval
+        self.headroom = headroom  # Processing time is padded by this factor when computing the minimum skip
+        self.window = window  # Number of recent processed frames averaged per adjustment
+        self.counter = 0
+        self.frames_seen = 0
+        self.last_adjust_time = None
+        self.last_adjust_frames = 0
+        self.capture_fps = 0.0
+        self.latency_ms = 0.0
+        self.adjustments = 0
+
+    @classmethod
+    def from_config(cls, processing_config):
+        return cls(frame_skip=processing_config['frame_skip'],
+                   adaptive=processing_config['adaptive'],
+                   target_latency_ms=processing_config['target_latency_ms'],
+                   min_frame_skip=processing_config['min_frame_skip'],
+                   max_frame_skip=processing_config['max_frame_skip'])
+
+    def schedule(self):
+        """Called by the capture thread for each frame; True if the frame should be processed"""
+        self.frames_seen += 1
+        self.counter += 1
+        if self.counter < self.frame_skip:
+            return False
+        self.counter = 0
+        return True
+
+    def update(self, performance_metrics, now=None):
+        """Called by the processing thread after each processed frame"""
+        if not self.adaptive:
+            return
+        now = time.monotonic() if now is None else now
+        if self.last_adjust_time is None:
+            self.last_adjust_time = now
+            self.last_adjust_frames = self.frames_seen
+            return
+        elapsed = now - self.last_adjust_time
+        if elapsed < self.adjust_interval:
+            return
+
+        frames_seen = self.frames_seen
+        self.capture_fps = (frames_seen - self.last_adjust_frames) / elapsed
+        self.last_adjust_time = now
+        self.last_adjust_frames = frames_seen
+
+        processing_ms = _recent_mean(performance_metrics['total'], self.window)
+        frame_age_ms = _recent_mean(performance_metrics['frame_age'], self.window)
+        self.latency_ms = frame_age_ms + processing_ms
+        if self.capture_fps <= 0 or processing_ms <= 0:
+            return
+
+        # Smallest skip at which a scheduled frame never has to wait for the previous one
+        frame_period_ms = 1000.0 / self.capture_fps
+        needed = math.ceil(processing_ms * self.headroom / frame_period_ms)
+
+        # Time a frame may wait for the processing thread; a frame can always wait up to one frame period
+        queue_budget_ms = max(self.target_latency_ms - processing_ms, frame_period_ms)
+
+        skip = self.frame_skip
+        if self.latency_ms > self.target_latency_ms:
+            skip = skip + 1 if frame_age_ms > queue_budget_ms else needed
+        elif self.latency_ms < 0.7 * self.target_latency_ms:
+            skip -= 1
+        skip = max(skip, needed)
+        skip = max(self.min_frame_skip, min(self.max_frame_skip, skip))
+        if skip != self.frame_skip:
+            self.frame_skip = skip
+            self.adjustments += 1
+
+    @property
+    def processing_fps(self):
+        """Rate at which frames are being scheduled for processing"""
+        return self.capture_fps / self.frame_skip if self.frame_skip else 0.0
+
+    def get_stats(self):
+        return {
+            'frame_skip': self.frame_skip,
+            'capture_fps': self.capture_fps,
+            'processing_fps': self.processing_fps,
+            'latency_ms': self.latency_ms,
+            'target_latency_ms': self.target_latency_ms,
+            'adjustments': self.adjustments
+        }
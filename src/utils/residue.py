@@ -2,29 +2,43 @@ import numpy as np
 import cv2
 import logging
 
-def detect_residue_colors(frame):
-    if frame is None or frame.size == 0:
-        return None, None
+from src.utils.config import get_config
 
+
+def hsv_residue_weights(frame, profiles):
+    """Residue weight (0-255) per pixel from the HSV colour profiles, one inRange per profile"""
     hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    lower_residue = np.array([5, 50, 50])
-    upper_residue = np.array([25, 255, 200])
-    lower_margin = np.array([5, int(50 * 0.85), int(50 * 0.85)])
-    upper_margin = np.array([25, 255, 200])
+    weights = np.zeros(frame.shape[:2], dtype=np.uint8)
+    for profile in profiles.values():
+        profile_mask = cv2.inRange(hsv, np.array(profile['lower']), np.array(profile['upper']))
+        weights = cv2.addWeighted(weights, 1.0, profile_mask, profile['weight'], 0)
+    return weights
+
+
+def residue_weights(frame):
+    """Residue weight per pixel from the configured colour profiles"""
+    return hsv_residue_weights(frame, get_config()['residue']['profiles'])
+
+
+def _odd(size):
+    return max(1, int(round(size)) // 2 * 2 + 1)
 
-    residue_mask = cv2.inRange(hsv, lower_residue, upper_residue)
-    margin_mask = cv2.inRange(hsv, lower_margin, upper_margin)
-    combined_mask = cv2.addWeighted(residue_mask, 1.0, margin_mask, 0.3, 0)
 
-    kernel = np.ones((7, 7), np.uint8)
-    combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_OPEN, kernel)
-    combined_mask = cv2.morphologyEx(combined_mask, cv2.MORPH_CLOSE, kernel)
-    combined_mask = cv2.GaussianBlur(combined_mask, (11, 11), 0)
+def clean_residue_mask(weights, scale=1.0):
+    """Open, close and blur a residue weight mask; kernel sizes shrink with scale for reduced-resolution masks"""
+    kernel = np.ones((_odd(7 * scale), _odd(7 * scale)), np.uint8)
+    mask = cv2.morphologyEx(weights, cv2.MORPH_OPEN, kernel)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+    blur = _odd(11 * scale)
+    return cv2.GaussianBlur(mask, (blur, blur), 0)
 
-    contours, _ = cv2.findContours(combined_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+def render_residue(frame, mask):
+    """Tint the residue pixels of frame and outline the larger residue patches"""
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
     overlay = frame.copy()
-    overlay[combined_mask > 0] = (42, 42, 165)
+    overlay[mask > 0] = (42, 42, 165)
     alpha = 0.4
     residue_detection = cv2.addWeighted(overlay, alpha, frame, 1 - alpha, 0)
 
@@ -32,21 +46,101 @@ def detect_residue_colors(frame):
         if cv2.contourArea(contour) > 100:
             x, y, w, h = cv2.boundingRect(contour)
             cv2.rectangle(residue_detection, (x, y), (x + w, y + h), (42, 42, 165), 1)
+    return residue_detection
+
+
+def detect_residue_mask(frame, object_mask=None):
+    """Residue mask of frame without any rendering; object_mask (uint8, frame-sized) limits it to the object"""
+    combined_mask = clean_residue_mask(residue_weights(frame))
+    if object_mask is not None:
+        cv2.bitwise_and(combined_mask, object_mask, dst=combined_mask)
+    return combined_mask
+
+
+def detect_residue_colors(frame, object_mask=None):
+    """Residue overlay and residue mask of frame; see detect_residue_mask()"""
+    if frame is None or frame.size == 0:
+        return None, None
+
+    combined_mask = detect_residue_mask(frame, object_mask)
+    return render_residue(frame, combined_mask), combined_mask
+
+
+class ResidueMap:
+    """Residue mask of a whole frame, computed once at reduced resolution, with a summed-area table.
+
+    Frames with several items pay for the colour classification and the
+    mask clean-up once instead of once per box, and overlapping boxes are
+    not processed twice. Counting the residue pixels of a box, or of every
+    cell of a coverage grid, then takes four table lookups each.
+
+    Boxes are given in the coordinates of the frame the detections are
+    drawn on; frame_scale is that frame's size relative to the image the map
+    is built from, as with a display copy that is upscaled by the crop factor.
+    """
+
+    def __init__(self, image, scale=0.5, frame_scale=(1.0, 1.0)):
+        self.scale_x = scale / frame_scale[0]
+        self.scale_y = scale / frame_scale[1]
+        small = image if scale == 1.0 else cv2.resize(image, None, fx=scale, fy=scale,
+                                                      interpolation=cv2.INTER_AREA)
+        self.mask = clean_residue_mask(residue_weights(small), scale)
+        self.sums = cv2.integral(np.minimum(self.mask, 1))  # (h + 1, w + 1) int32 counts of residue cells
+
+    def _cells(self, box):
+        """Mask cell range (u1, v1, u2, v2) covering a frame box"""
+        h, w = self.mask.shape
+        x1, y1, x2, y2 = box
+        u1 = min(w, max(0, int(x1 * self.scale_x)))
+        v1 = min(h, max(0, int(y1 * self.scale_y)))
+        u2 = min(w, max(u1, int(np.ceil(x2 * self.scale_x))))
+        v2 = min(h, max(v1, int(np.ceil(y2 * self.scale_y))))
+        return u1, v1, u2, v2
+
+    def count(self, box):
+        """Residue cells and total cells under a frame box (x1, y1, x2, y2)"""
+        u1, v1, u2, v2 = self._cells(box)
+        sums = self.sums
+        residue = int(sums[v2, u2]) - int(sums[v1, u2]) - int(sums[v2, u1]) + int(sums[v1, u1])
+        return residue, (u2 - u1) * (v2 - v1)
+
+    def box_mask(self, box):
+        """The map's residue mask under a frame box, resized to the box"""
+        x1, y1, x2, y2 = box
+        u1, v1, u2, v2 = self._cells(box)
+        if u2 <= u1 or v2 <= v1:
+            return np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+        return cv2.resize(self.mask[v1:v2, u1:u2], (x2 - x1, y2 - y1), interpolation=cv2.INTER_NEAREST)
+
+    def score(self, box):
+        """Residue score of the box, as calculate_residue_score() over its area"""
+        residue, cells = self.count(box)
+        return residue_score(residue, cells)
+
+    def coverage(self, cell_size=32):
+        """Fraction of residue pixels in each cell_size x cell_size cell of the frame, as a heat-map grid"""
+        h, w = self.mask.shape
+        step_x = max(1, int(round(cell_size * self.scale_x)))
+        step_y = max(1, int(round(cell_size * self.scale_y)))
+        xs = np.append(np.arange(0, w, step_x), w)
+        ys = np.append(np.arange(0, h, step_y), h)
+        corners = self.sums[np.ix_(ys, xs)].astype(np.int64)
+        residue = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+        cells = np.outer(np.diff(ys), np.diff(xs))
+        return (residue / cells).astype(np.float32)
+
+
+def residue_score(residue_pixels, area):
+    """Residue score (0-100) for residue_pixels out of area pixels: twice the residue percentage, capped"""
+    if area <= 0:
+        return 0.0
+    return min(residue_pixels / area * 100 * 2, 100.0)
 
-    return residue_detection, combined_mask
 
 def calculate_residue_score(residue_mask, bbox_area):
-    """Calculate residue score based on residue mask and bounding box area"""
+    """Calculate residue score based on residue mask and object area (mask pixels, or bounding box area)"""
     try:
-        # Calculate residue percentage
-        residue_pixels = np.sum(residue_mask > 0)
-        residue_percentage = (residue_pixels / bbox_area) * 100
-        
-        # Double the contamination value
-        doubled_percentage = residue_percentage * 2
-        
-        # Cap at 100%
-        return min(doubled_percentage, 100.0)
+        return residue_score(np.sum(residue_mask > 0), bbox_area)
     except Exception as e:
         logging.error(f"Error calculating residue score: {str(e)}")
-        return 0.0 
\ No newline at end of file
+        return 0.0
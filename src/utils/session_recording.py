@@ -0,0 +1,230 @@
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from queue import Queue, Full, Empty
+
+import cv2
+import numpy as np
+
+FORMAT_VERSION = 1
+ENCODING_RAW = 0
+ENCODING_JPEG = 1
+ENCODINGS = {'raw': ENCODING_RAW, 'jpeg': ENCODING_JPEG}
+
+# One fixed-size record per frame, appended to index.bin as frames are written
+INDEX_DTYPE = np.dtype([
+    ('seq', '<i8'),
+    ('timestamp', '<f8'),   # time.monotonic() at capture
+    ('chunk', '<u4'),
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('height', '<u2'),
+    ('width', '<u2'),
+    ('channels', '<u1'),
+    ('encoding', '<u1'),
+])
+
+
+def chunk_path(session_dir, chunk):
+    return Path(session_dir) / f"chunk_{chunk:05d}.bin"
+
+
+class SessionRecorder:
+    """Records captured frames to a session directory for later replay.
+
+    A session is a directory holding meta.json, chunk_NNNNN.bin files with the
+    raw or JPEG-encoded frames back to back, and index.bin with one INDEX_DTYPE
+    record per frame. Encoding and disk writes happen on a background thread;
+    if it falls behind, frames are dropped from the recording (never from the
+    live pipeline) and counted.
+    """
+
+    def __init__(self, path, encoding='jpeg', jpeg_quality=90, chunk_size_mb=256, max_pending=30, source=None):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown recording encoding '{encoding}'")
+        self.path = Path(path)
+        self.encoding = encoding
+        self.jpeg_quality = jpeg_quality
+        self.chunk_size = chunk_size_mb * 1024 * 1024
+        self.source = source
+        self.pending = Queue(maxsize=max_pending)
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+        self.chunk = 0
+        self.chunk_file = None
+        self.index_file = None
+        self.writer_thread = None
+        self.running = False
+
+    def start(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = {
+            'version': FORMAT_VERSION,
+            'encoding': self.encoding,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source': self.source
+        }
+        with open(self.path / 'meta.json', 'w') as f:
+            json.dump(meta, f, indent=2)
+        self.index_file = open(self.path / 'index.bin', 'wb')
+        self.chunk_file = open(chunk_path(self.path, self.chunk), 'wb')
+        self.running = True
+        self.writer_thread = threading.Thread(target=self._write_frames, daemon=True)
+        self.writer_thread.start()
+        print(f"Recording session to {self.path} ({self.encoding})")
+
+    def write(self, frame, timestamp, seq):
+        """Queue a frame for recording. The frame is copied, so the caller may reuse it"""
+        if not self.running:
+            return False
+        try:
+            self.pending.put_nowait((frame.copy(), timestamp, seq))
+            return True
+        except Full:
+            self.frames_dropped += 1
+            return False
+
+    def _write_frames(self):
+        while self.running or not self.pending.empty():
+            try:
+                frame, timestamp, seq = self.pending.get(timeout=0.1)
+            except Empty:
+                continue
+            if self.encoding == 'jpeg':
+                ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if not ok:
+                    self.frames_dropped += 1
+                    continue
+                data = encoded.tobytes()
+            else:
+                data = np.ascontiguousarray(frame).tobytes()
+
+            if self.chunk_file.tell() > 0 and self.chunk_file.tell() + len(data) > self.chunk_size:
+                self.chunk_file.close()
+                self.chunk += 1
+                self.chunk_file = open(chunk_path(self.path, self.chunk), 'wb')
+            offset = self.chunk_file.tell()
+            self.chunk_file.write(data)
+
+            record = np.zeros(1, dtype=INDEX_DTYPE)
+            record['seq'] = seq
+            record['timestamp'] = timestamp
+            record['chunk'] = self.chunk
+            record['offset'] = offset
+            record['length'] = len(data)
+            record['height'], record['width'] = frame.shape[:2]
+            record['channels'] = frame.shape[2] if frame.ndim == 3 else 1
+            record['encoding'] = ENCODINGS[self.encoding]
+            self.index_file.write(record.tobytes())
+            self.frames_written += 1
+            self.bytes_written += len(data)
+
+    def stop(self):
+        """Flush pending frames and close the session files"""
+        if not self.running:
+            return
+        self.running = False
+        self.writer_thread.join()
+        self.chunk_file.close()
+        self.index_file.close()
+        print(f"Recorded {self.frames_written} frames ({self.bytes_written / 1e6:.1f} MB), "
+              f"dropped {self.frames_dropped}: {self.path}")
+
+
+class SessionReader:
+    """Random access to a recorded session without loading it into memory.
+
+    The index and chunk files are memory-mapped, so replaying hours of footage
+    only touches the pages of the frames actually read.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if not (self.path / 'index.bin').exists():
+            raise Exception(f"Not a recorded session: {self.path}")
+        with open(self.path / 'meta.json', 'r') as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != FORMAT_VERSION:
+            raise Exception(f"Unsupported session format version {self.meta.get('version')}")
+        index_size = (self.path / 'index.bin').stat().st_size // INDEX_DTYPE.itemsize
+        if index_size:
+            self.index = np.memmap(self.path / 'index.bin', dtype=INDEX_DTYPE, mode='r', shape=(index_size,))
+        else:
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        self.chunks = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def _chunk(self, chunk):
+        data = self.chunks.get(chunk)
+        if data is None:
+            data = np.memmap(chunk_path(self.path, chunk), dtype=np.uint8, mode='r')
+            self.chunks[chunk] = data
+        return data
+
+    def timestamp(self, position):
+        return float(self.index[position]['timestamp'])
+
+    def read(self, position, image=None):
+        """Decode frame number position, into image if it has the right shape"""
+        record = self.index[position]
+        offset = int(record['offset'])
+        data = self._chunk(int(record['chunk']))[offset:offset + int(record['length'])]
+        height, width, channels = int(record['height']), int(record['width']), int(record['channels'])
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        if record['encoding'] == ENCODING_JPEG:
+            frame = cv2.imdecode(data, cv2.IMREAD_COLOR if channels > 1 else cv2.IMREAD_GRAYSCALE)
+            if image is not None and image.shape == frame.shape:
+                np.copyto(image, frame)
+                return image
+            return frame
+        frame = data.reshape(shape)
+        if image is not None and image.shape == shape:
+            np.copyto(image, frame)
+            return image
+        return np.array(frame)
+
+    def close(self):
+        self.chunks.clear()
+        self.index = None
+
+
+def describe_session(path):
+    """Summary of a recorded session for printing"""
+    reader = SessionReader(path)
+    count = len(reader)
+    duration = reader.timestamp(count - 1) - reader.timestamp(0) if count > 1 else 0.0
+    return {
+        'frames': count,
+        'duration_s': duration,
+        'fps': (count - 1) / duration if duration > 0 else 0.0,
+        'encoding': reader.meta.get('encoding'),
+        'created': reader.meta.get('created')
+    }
+
+
+def record_frames(source, path, duration=None, **recorder_options):
+    """Record frames straight from a FrameSource without running the pipeline"""
+    recorder = SessionRecorder(path, source=source.describe(), **recorder_options)
+    recorder.start()
+    start_time = time.monotonic()
+    seq = 0
+    try:
+        while duration is None or time.monotonic() - start_time < duration:
+            ret, frame = source.read()
+            if not ret:
+                if source.finished:
+                    break
+                time.sleep(0.05)
+                continue
+            seq += 1
+            recorder.write(frame, time.monotonic(), seq)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.stop()
+    return recorder.frames_written
@@ -0,0 +1,112 @@
+import os
+import threading
+
+import cv2
+import torch
+
+from src.utils.config import get_config
+
+
+def available_cores():
+    """Cores this process may run on (respects taskset/cgroup limits where the OS reports them)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class ThreadingPlan:
+    """How the CPU cores are shared between the UI, capture, OpenCV and inference.
+
+    The first ui_cores cores are left to the Qt thread and the capture
+    threads; the rest belong to inference. PyTorch's intra-op pool is sized
+    to the inference cores and OpenCV's pool is kept small, so the two do
+    not oversubscribe the machine. With pin_threads the capture threads and
+    the threads doing inference are also bound to their cores.
+    """
+
+    def __init__(self, cores, ui_cores=1, inference_threads=0, opencv_threads=0, pin_threads=False):
+        self.cores = list(cores)
+        ui_count = min(ui_cores, len(self.cores) - 1) if len(self.cores) > 1 else 0
+        self.ui_cores = self.cores[:ui_count] or self.cores
+        self.inference_cores = self.cores[ui_count:]
+        self.inference_threads = inference_threads or len(self.inference_cores)
+        self.opencv_threads = opencv_threads or (1 if len(self.cores) <= 4 else 2)
+        self.pin_threads = pin_threads and hasattr(os, 'sched_setaffinity')
+        self.applied = False
+
+    @classmethod
+    def from_config(cls, threading_config):
+        return cls(available_cores(),
+                   ui_cores=threading_config['ui_cores'],
+                   inference_threads=threading_config['inference_threads'],
+                   opencv_threads=threading_config['opencv_threads'],
+                   pin_threads=threading_config['pin_threads'])
+
+    def cores_for(self, role):
+        """Cores a thread with the given role ('ui', 'capture' or 'inference') should run on"""
+        return self.inference_cores if role == 'inference' else self.ui_cores
+
+    def worker_cores(self, index, workers):
+        """Disjoint share of the inference cores for inference worker process number index"""
+        cores = self.inference_cores
+        if workers >= len(cores):
+            return [cores[index % len(cores)]]
+        start = index * len(cores) // workers
+        end = (index + 1) * len(cores) // workers
+        return cores[start:end]
+
+    def apply(self):
+        """Size the torch and OpenCV thread pools for this process"""
+        torch.set_num_threads(self.inference_threads)
+        try:
+            torch.set_num_interop_threads(1)  # Each pipeline already submits from its own thread
+        except RuntimeError:
+            pass  # Only allowed before torch has started any inter-op work
+        cv2.setNumThreads(self.opencv_threads)
+        self.applied = True
+
+    def describe(self):
+        lines = [
+            f"Threading plan for {len(self.cores)} cores:",
+            f"  UI and capture: cores {self.ui_cores}",
+            f"  Inference: {self.inference_threads} torch threads on cores {self.inference_cores}",
+            f"  OpenCV: {self.opencv_threads} threads",
+            f"  Thread pinning: {'on' if self.pin_threads else 'off'}"
+        ]
+        if not self.applied:
+            lines.append("  (not applied: threading.enabled is false)")
+        return '\n'.join(lines)
+
+
+_plan = None
+_plan_lock = threading.Lock()
+
+
+def get_threading_plan():
+    """Return the process-wide plan, built from the config on first use"""
+    global _plan
+    with _plan_lock:
+        if _plan is None:
+            _plan = ThreadingPlan.from_config(get_config()['threading'])
+        return _plan
+
+
+def apply_threading_plan():
+    """Apply the configured plan at startup and print it; returns the plan"""
+    plan = get_threading_plan()
+    if get_config()['threading']['enabled']:
+        plan.apply()
+        pin_current_thread('ui')  # Threads started from here on inherit the UI cores until they pin themselves
+    print(plan.describe())
+    return plan
+
+
+def pin_current_thread(role):
+    """Bind the calling thread to the plan's cores for role; no-op unless pin_threads is set"""
+    plan = _plan
+    if plan is None or not plan.applied or not plan.pin_threads:
+        return
+    try:
+        os.sched_setaffinity(0, plan.cores_for(role))  # On Linux, 0 means the calling thread
+    except OSError as e:
+        print(f"Warning: could not pin {role} thread: {e}")
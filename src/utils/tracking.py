@@ -1,26 +1,190 @@
 import cv2
-import math
+import heapq
+import itertools
 import random
 import string
 import time
 
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
 def get_centroid(x1, y1, x2, y2):
     """Calculate the centroid of a bounding box"""
     return ((x1 + x2) // 2, (y1 + y2) // 2)
 
-def match_object(centroid, object_trackers, threshold=50):
-    """Find existing object ID by centroid proximity"""
-    best_match = None
-    min_distance = float('inf')
-    
-    for obj_id, data in object_trackers.items():
-        prev_centroid = data['centroid']
-        distance = math.hypot(centroid[0] - prev_centroid[0], centroid[1] - prev_centroid[1])
-        if distance < threshold and distance < min_distance:
-            min_distance = distance
-            best_match = obj_id
-            
-    return best_match
+def pairwise_iou(boxes_a, boxes_b):
+    """(len(a), len(b)) IoU of every pair of x1, y1, x2, y2 boxes"""
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+def assignment_cost(track_boxes, boxes, max_distance=50.0, iou_weight=0.5):
+    """(tracks, detections) cost of continuing each track with each box.
+
+    The cost is the centroid distance as a fraction of max_distance plus
+    iou_weight * (1 - IoU); pairs whose centroids are max_distance or more
+    apart are gated out with an infinite cost.
+    """
+    track_centres = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+    centres = (boxes[:, :2] + boxes[:, 2:]) / 2
+    offsets = track_centres[:, None, :] - centres[None, :, :]
+    distance = np.hypot(offsets[:, :, 0], offsets[:, :, 1])
+    cost = distance / max_distance + iou_weight * (1.0 - pairwise_iou(track_boxes, boxes))
+    cost[distance >= max_distance] = np.inf
+    return cost
+
+
+def assign_detections(track_boxes, boxes, max_distance=50.0, iou_weight=0.5):
+    """Match detection boxes to tracks in one global assignment step.
+
+    Each track gets at most one detection and vice versa, choosing the
+    combination with the lowest total assignment_cost(). Returns, for each
+    detection, the index of its track or -1 if it starts a new one.
+    """
+    matches = np.full(len(boxes), -1, dtype=np.intp)
+    if len(track_boxes) == 0 or len(boxes) == 0:
+        return matches
+    cost = assignment_cost(np.asarray(track_boxes, dtype=np.float32), np.asarray(boxes, dtype=np.float32),
+                           max_distance, iou_weight)
+    allowed = np.isfinite(cost)
+    if not allowed.any():
+        return matches
+    # Gated pairs get a cost no allowed combination can reach, and are dropped from the solution
+    rows, cols = linear_sum_assignment(np.where(allowed, cost, cost[allowed].max() * len(boxes) + 1e6))
+    keep = allowed[rows, cols]
+    matches[cols[keep]] = rows[keep]
+    return matches
+
+ANALYZING = 'analyzing'
+FINALIZED = 'finalized'
+
+
+class TrackRecord:
+    """State of one tracked item on the belt"""
+    __slots__ = ('track_id', 'centroid', 'box', 'created', 'state', 'result', 'confidence', 'waste_type',
+                 'last_update', 'last_seen', 'stable_count', 'scout_cls', 'finalized_time', 'expiry')
+
+    def __init__(self, track_id, centroid, box, confidence, now):
+        self.track_id = track_id
+        self.centroid = centroid
+        self.box = box
+        self.created = now
+        self.state = ANALYZING
+        self.result = None
+        self.confidence = confidence
+        self.waste_type = None
+        self.last_update = now  # Last time the best-confidence box changed
+        self.last_seen = now  # Last time any box was matched to the track
+        self.stable_count = 0
+        self.scout_cls = None
+        self.finalized_time = None
+        self.expiry = None  # Deadline of this record's live entry in the expiry heap
+
+    @property
+    def finalized(self):
+        return self.state == FINALIZED
+
+
+class TrackStore:
+    """Tracks by ID, with time-based eviction through a min-heap of deadlines.
+
+    A track is dropped max_age seconds after it was last seen, or
+    finalized_timeout seconds after it was finalized. Each record has one
+    live heap entry; seeing a track again only moves its deadline later, so
+    nothing is pushed then. When an entry comes due, expire() evicts the
+    track if its real deadline has passed and otherwise re-queues it, which
+    keeps eviction amortized O(1) per frame instead of a scan of all tracks.
+    """
+
+    def __init__(self, max_age=2.0, finalized_timeout=5.0):
+        self.max_age = max_age
+        self.finalized_timeout = finalized_timeout
+        self.tracks = {}
+        self.heap = []  # (deadline, sequence, track_id)
+        self.sequence = itertools.count()
+        self.total = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __contains__(self, track_id):
+        return track_id in self.tracks
+
+    def __getitem__(self, track_id):
+        return self.tracks[track_id]
+
+    def ids(self):
+        return list(self.tracks)
+
+    @property
+    def live(self):
+        return len(self.tracks)
+
+    def deadline(self, record):
+        if record.finalized:
+            return record.finalized_time + self.finalized_timeout
+        return record.last_seen + self.max_age
+
+    def _schedule(self, record):
+        deadline = self.deadline(record)
+        if record.expiry is None or deadline < record.expiry:
+            record.expiry = deadline
+            heapq.heappush(self.heap, (deadline, next(self.sequence), record.track_id))
+
+    def create(self, centroid, box, confidence, now):
+        """Start a track under a new unique ID and return its record"""
+        record = TrackRecord(generate_unique_id(self.tracks, ()), centroid, box, confidence, now)
+        self.tracks[record.track_id] = record
+        self.total += 1
+        self._schedule(record)
+        return record
+
+    def touch(self, record, now):
+        """Note that the track was matched again; its deadline moves later without a heap update"""
+        record.last_seen = now
+
+    def finalize(self, record, result, now):
+        """Store the track's result; returns False and changes nothing if it was already finalized.
+
+        A finalized track keeps its first result and its finalized_timeout
+        deadline, so finalizing it again cannot keep it alive.
+        """
+        if record.finalized:
+            return False
+        record.result = result
+        record.state = FINALIZED
+        record.finalized_time = now
+        self._schedule(record)
+        return True
+
+    def expire(self, now):
+        """Drop every track whose deadline has passed; returns how many were dropped"""
+        dropped = 0
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            deadline, _, track_id = heapq.heappop(heap)
+            record = self.tracks.get(track_id)
+            if record is None or record.expiry != deadline:
+                continue  # Entry of an evicted track, or superseded by an earlier deadline
+            record.expiry = None
+            if self.deadline(record) <= now:
+                del self.tracks[track_id]
+                dropped += 1
+            else:
+                self._schedule(record)
+        self.evicted += dropped
+        return dropped
+
+    def get_stats(self):
+        return {'live': self.live, 'total': self.total, 'evicted': self.evicted, 'heap': len(self.heap)}
+
 
 def generate_unique_id(object_trackers, finalized_ids):
     """Generate a unique 4-character alphanumeric ID"""
@@ -2,36 +2,62 @@ import cv2
 import torch
 import time
 import numpy as np
-import math
-from ultralytics import YOLO
 import threading
-from queue import Queue
 import os
 from datetime import datetime
 from pathlib import Path
 from src.utils.app_client import app_client
 from src.utils.classification import classify_output
-from src.utils.residue import detect_residue_colors, calculate_residue_score
+from src.utils.residue import (detect_residue_mask, calculate_residue_score, render_residue,
+                               residue_score, ResidueMap)
 from src.utils.database import store_measurement, generate_unique_id
 from src.utils.animation import add_detection_animation, add_scan_effect
-from src.utils.tracking import get_centroid, match_object, update_tracking, start_tracking
+from src.utils.tracking import TrackStore, assign_detections, update_tracking, start_tracking
+from src.utils.frame_mailbox import FrameMailbox
+from src.utils.buffer_pool import BufferPool
+from src.utils.session_recording import SessionRecorder
+from src.utils.frame_source import create_frame_source
+from src.utils.config import get_config
+from src.utils.inference import InferenceScheduler
+from src.utils.inference_workers import InferenceWorkerPool
+from src.utils.rate_controller import RateController
+from src.utils.motion_gate import MotionGate
+from src.utils.preprocess import TensorLetterbox, model_input_shape, unletterbox_boxes
+from src.utils.inference_backends import BACKENDS
+from src.utils.postprocess import InstanceMasks, filter_detections, waste_type_names
+from src.utils.threading_plan import pin_current_thread
+from src.utils.cascade import CascadeRefiner
+from src.utils.interframe import FlowTracker
+
+NO_DETECTIONS = np.zeros((0, 6), dtype=np.float32)
+OUTPUTS = ('model', 'residue', 'mask')  # Rendered views a consumer can subscribe to
 
 class VideoProcessor:
-    _instance = None
-    _camera = None
-    _initialized = False
-    
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(VideoProcessor, cls).__new__(cls)
-        return cls._instance
-    
-    def __init__(self, model_path='best.pt'):
-        self.model = YOLO(model_path, verbose=False)
+    """Capture and detection pipeline for one camera.
+
+    Create one instance per belt. Every instance has its own frame source,
+    trackers and latest result, while the YOLO model and the inference
+    scheduler are shared by all pipelines using the same model file.
+    """
+
+    def __init__(self, model_path=None, source=None, scheduler=None, name=None):
+        inference_config = get_config()['inference']
+        self.model_path = model_path or inference_config['model_path']
+        self.inference_backend = inference_config['backend']
+        self.inference_imgsz = inference_config['imgsz']
+        self.inference_precision = inference_config['precision']
+        self.use_masks = inference_config['task'] == 'segment'
+        self.mask_downsample = inference_config['mask_downsample']
+        self.scheduler = scheduler
+        self.cascade = None  # CascadeRefiner when cascade.enabled is set
+        self.source_config = source or get_config()['source']
+        self.name = name or self.source_config.get('type', 'camera')
+        self._initialized = False
         self.is_running = False
         self.current_frame = None
         self.frame_lock = threading.Lock()
-        self.detection_interval = 0.2  # Increased from 0.1 to reduce processing load
+        processing_config = get_config()['processing']
+        self.detection_interval = processing_config['detection_interval']
         self.last_detection_time = 0
         self.detection_callback = None
         self.camera = None
@@ -41,7 +67,7 @@ class VideoProcessor:
         self.detection_thread = None
         self.detection_running = False
         self.detection_lock = threading.Lock()
-        self.frame_skip = 3  # Increased from 2 to reduce processing load
+        self.rate_controller = RateController.from_config(processing_config)
         
         # Performance metrics
         self.performance_metrics = {
@@ -50,6 +76,8 @@ class VideoProcessor:
             'inference': [],
             'postprocess': [],
             'total': [],
+            'frame_age': [],  # Time from capture to start of processing
+            'assignment': [],  # Detection-to-track assignment
             'confidence': []  # Add confidence tracking
         }
         self.metrics_counter = 0
@@ -64,11 +92,24 @@ class VideoProcessor:
         self.last_valid_bbox = None
         self.smoothing_factor = 0.7
         self.min_confidence = 0.5
+        self.type_confidence = 0.8  # Minimum confidence to accept the detected waste type
         self.min_iou = 0.4
         self.bbox_history = []
         self.max_history = 5
         self.cap = None
-        self.frame_queue = Queue(maxsize=2)
+        self.frame_mailbox = FrameMailbox()  # Always holds only the newest captured frame
+        self.buffer_pool = BufferPool()  # Recycled capture and output frames
+        self.result_lock = threading.Lock()
+        self.subscription_lock = threading.Lock()
+        self.subscribers = dict.fromkeys(OUTPUTS, 0)  # Output -> number of consumers displaying it
+        self._capture_shape = None
+        self.frames_skipped = 0
+        self.frames_processed = 0
+        self.publish_detections = True  # Store results and drive the servos; disabled for headless benchmarks
+        self.recorder = None
+        self.capture_retry_delay = 0.05
+        self.capture_mode = get_config()['capture']['mode']
+        self.frame_wait_timeout = 0.5  # Upper bound on how long the processing thread sleeps between checks of self.running
         self.running = False
         self.processing = False
         self.last_boxes = []
@@ -78,71 +119,101 @@ class VideoProcessor:
         self.current_contamination_score = 0
         self.background = None
         self.background_captured = False
+        self.motion_gate = MotionGate.from_config(get_config()['motion_gate'])
+        roi_config = get_config()['roi']
+        self.roi_inference = roi_config['enabled']
+        self.roi_margin = roi_config['margin']
+        self.roi_min_size = roi_config['min_size']
+        self.frames_roi_cropped = 0
+        residue_config = get_config()['residue']
+        self.residue_frame_map = residue_config['frame_map']
+        self.residue_map_scale = residue_config['map_scale']
+        self.residue_coverage_cell = residue_config['coverage_cell']
+        tracking_config = get_config()['tracking']
+        self.flow_tracker = FlowTracker.from_config(get_config()['interframe'])
+        self.track_max_distance = tracking_config['max_distance']
+        self.track_iou_weight = tracking_config['iou_weight']
         self.animation_time = 0
         self.zoom_factor = 1.0
         self.initialized = True
         self.latest_result = None
-        self.object_trackers = {}
         self.next_object_id = 1
-        self.finalized_ids = set()
-        self._frame_skip_counter = 0
         self.crop_factor = 0.9
         self.frame_size = (480, 640)  # Reduced from (640, 480) for better performance
         self.finalized_timeout = 5.0
-        self.finalized_times = {}
+        self.tracks = TrackStore(max_age=tracking_config['max_age'], finalized_timeout=self.finalized_timeout)
         self.min_detection_area = 10000
         self.max_detection_area = 300000
-        self.processing_size = (320, 240)  # Smaller size for processing
+        self.dynamic_input = BACKENDS[self.inference_backend].dynamic_input
+        self.tensor_letterbox = TensorLetterbox()  # Reused network input tensor
         
         # Cooldown timer for detections
         self.last_detection_times = {}  # Dictionary to store last detection time per waste type
         self.detection_cooldown = 3.0  # Cooldown period in seconds
 
     def initialize(self):
-        if not VideoProcessor._initialized:
-            print("Trying to connect to camera index 0...")
-            VideoProcessor._camera = cv2.VideoCapture(0)
-            if not VideoProcessor._camera.isOpened():
-                raise Exception("Could not connect to camera at index 0. Please check your camera connection.")
-            try:
-                # Set optimized resolution for Raspberry Pi
-                VideoProcessor._camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                VideoProcessor._camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                VideoProcessor._camera.set(cv2.CAP_PROP_FPS, 30)
-                VideoProcessor._camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-                VideoProcessor._camera.set(cv2.CAP_PROP_AUTO_EXPOSURE, 1)
-                VideoProcessor._camera.set(cv2.CAP_PROP_EXPOSURE, -6)
-                VideoProcessor._camera.set(cv2.CAP_PROP_GAIN, 100)
-                actual_width = VideoProcessor._camera.get(cv2.CAP_PROP_FRAME_WIDTH)
-                actual_height = VideoProcessor._camera.get(cv2.CAP_PROP_FRAME_HEIGHT)
-                print(f"Camera resolution set to: {actual_width}x{actual_height}")
-            except Exception as e:
-                print(f"Warning: Could not set all camera properties: {str(e)}")
-            try:
-                self.model = YOLO("best.pt", verbose=False)
-                self.model.to('cpu')  # Force CPU usage
-                print("Model loaded successfully")
-            except Exception as e:
-                raise Exception(f"Failed to load YOLO model: {str(e)}")
+        if not self._initialized:
+            self.cap = create_frame_source(self.source_config)
+            self.cap.open()
+            print(f"[{self.name}] Frame source opened: {self.cap.describe()}")
+            self.preload_model()
             try:
-                ret, frame = VideoProcessor._camera.read()
+                ret, frame = self.cap.read()
                 if ret:
-                    frame = cv2.resize(frame, self.frame_size)
-                    frame = cv2.GaussianBlur(frame, (5, 5), 0)
-                    frame = cv2.convertScaleAbs(frame, alpha=1.2, beta=10)
+                    # The belt is assumed empty at start-up; the motion gate learns from here on
                     self.background = frame.copy()
+                    self.motion_gate.seed(self.crop_view(frame)[0])
                     self.background_captured = True
                     print("Initial background captured")
                 else:
                     print("Warning: Could not capture initial background")
             except Exception as e:
                 print(f"Warning: Error capturing initial background: {str(e)}")
-            VideoProcessor._initialized = True
-        self.cap = VideoProcessor._camera
+            self._initialized = True
+
+    def preload_model(self):
+        """Start loading the model in the background without waiting for it"""
+        if self.scheduler is None:
+            inference_config = get_config()['inference']
+            cascade_config = get_config()['cascade']
+            warmup_shape = model_input_shape(self.source_config.get('height', 480), self.source_config.get('width', 640),
+                                             self.inference_imgsz, self.dynamic_input)
+            # In cascade mode the small scout model runs on every frame and model_path is only used to refine
+            frame_model_path = cascade_config['scout_model_path'] if cascade_config['enabled'] else self.model_path
+            if cascade_config['enabled']:
+                refine_scheduler = InferenceScheduler.shared(self.model_path, self.inference_backend,
+                                                             self.inference_imgsz, self.inference_precision,
+                                                             task=inference_config['task'])
+                self.cascade = CascadeRefiner(refine_scheduler, self.inference_imgsz, self.dynamic_input,
+                                              low=cascade_config['ambiguous_low'],
+                                              high=cascade_config['ambiguous_high'],
+                                              crop_margin=cascade_config['crop_margin'],
+                                              max_refines=cascade_config['max_refines_per_frame'])
+            if inference_config['workers'] > 0:
+                self.scheduler = InferenceWorkerPool.shared(frame_model_path, self.inference_backend,
+                                                            self.inference_imgsz, self.inference_precision,
+                                                            workers=inference_config['workers'],
+                                                            threads_per_worker=inference_config['threads_per_worker'],
+                                                            warmup_shape=warmup_shape,
+                                                            warmup_runs=inference_config['warmup_runs'],
+                                                            task=inference_config['task'])
+            else:
+                self.scheduler = InferenceScheduler.shared(frame_model_path, self.inference_backend,
+                                                           self.inference_imgsz, self.inference_precision,
+                                                           warmup_shape=warmup_shape, task=inference_config['task'])
+        return self.scheduler.model_entry
+
+    @property
+    def model(self):
+        """The shared InferenceBackend (or worker pool); blocks until it has finished loading"""
+        return self.preload_model().wait()
 
     def start(self):
         if not self.running:
             self.running = True
+            if get_config()['recording']['path'] and self.recorder is None:
+                self.start_recording()
+            self.frame_mailbox.open()
             self.capture_thread = threading.Thread(target=self._capture_frames, daemon=True)
             self.process_thread = threading.Thread(target=self._process_frames, daemon=True)
             self.capture_thread.start()
@@ -150,21 +221,149 @@ class VideoProcessor:
 
     def stop(self):
         self.running = False
-        self.latest_result = None
+        self.frame_mailbox.close()  # Wakes the processing thread so it can exit
+        capture_thread = getattr(self, 'capture_thread', None)
+        if capture_thread is not None and capture_thread is not threading.current_thread():
+            capture_thread.join(timeout=1.0)  # Let a grab in flight finish before the camera can be released
+        self._publish_result(None)
+        self.stop_recording()
+
+    def start_recording(self, path=None):
+        """Record every captured frame to a session directory that ReplaySource can play back"""
+        recording = get_config()['recording']
+        if path is None:
+            base = Path(recording['path'] or 'recordings')
+            path = base / f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        recorder = SessionRecorder(path, encoding=recording['encoding'], jpeg_quality=recording['jpeg_quality'],
+                                   chunk_size_mb=recording['chunk_size_mb'],
+                                   source=self.cap.describe() if self.cap else None)
+        recorder.start()
+        self.recorder = recorder
+        return path
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.stop()
+
+    def _publish_result(self, result):
+        """Replace latest_result and release the buffers of the previous one"""
+        with self.result_lock:
+            previous = self.latest_result
+            self.latest_result = result
+        if previous is not None:
+            self.release_result(previous)
+
+    def acquire_latest_result(self):
+        """Return latest_result with its frame buffers retained, or None.
+
+        The caller must pass the result to release_result() when it is done
+        reading the frames, otherwise the buffers are never recycled.
+        """
+        with self.result_lock:
+            result = self.latest_result
+            if result is None:
+                return None
+            for lease in result['leases']:
+                lease.retain()
+            return result
+
+    def release_result(self, result):
+        for lease in result['leases']:
+            lease.release()
+
+    def subscribe(self, output):
+        """Start rendering output ('model', 'residue' or 'mask') into the results; call once per consumer"""
+        if output not in OUTPUTS:
+            raise ValueError(f"Unknown output '{output}'. Choose from {', '.join(OUTPUTS)}")
+        with self.subscription_lock:
+            self.subscribers[output] += 1
+
+    def unsubscribe(self, output):
+        """Undo one subscribe(); the output is no longer rendered once nobody is subscribed"""
+        with self.subscription_lock:
+            self.subscribers[output] = max(0, self.subscribers[output] - 1)
+
+    def subscribed_outputs(self):
+        with self.subscription_lock:
+            return {output for output, count in self.subscribers.items() if count}
 
     def release_camera(self):
-        if VideoProcessor._camera is not None:
-            VideoProcessor._camera.release()
-            VideoProcessor._camera = None
-            VideoProcessor._initialized = False
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+            self._initialized = False
 
     def _capture_frames(self):
+        pin_current_thread('capture')
+        decode_on_demand = self.capture_mode == 'decode_on_demand'
+        capture_seq = 0
         while self.running:
-            ret, frame = self.cap.read()
-            if ret:
-                if not self.frame_queue.full():
-                    self.frame_queue.put(frame)
-            time.sleep(0.01)
+            # grab()/read() block until the camera delivers the next frame
+            lease = None
+            if decode_on_demand:
+                ret = self.cap.grab()
+                frame = None
+            else:
+                lease = self._lease_capture_buffer()
+                ret, frame = self.cap.read(lease.array if lease else None)
+            if not ret:
+                if lease is not None:
+                    lease.release()
+                if self.cap.finished:
+                    print(f"[{self.name}] Frame source exhausted: {self.cap.describe()}")
+                    break
+                time.sleep(self.capture_retry_delay)  # Avoid spinning on a disconnected camera
+                continue
+            capture_time = time.monotonic()
+            capture_seq += 1
+            scheduled = self._schedule_frame()
+            recorder = self.recorder
+            track_only = not scheduled and self.flow_tracker.enabled  # Decoded to move the boxes between detections
+            if not scheduled and recorder is None and not track_only:
+                if lease is not None:
+                    lease.release()
+                continue  # Grabbed but never decoded when decode_on_demand is active
+            if decode_on_demand:
+                lease = self._lease_capture_buffer()
+                ret, frame = self.cap.retrieve(lease.array if lease else None)
+                if not ret:
+                    if lease is not None:
+                        lease.release()
+                    continue
+            if recorder is not None:
+                recorder.write(frame, capture_time, capture_seq)  # Records every frame, processed or not
+            if not scheduled and not track_only:
+                if lease is not None:
+                    lease.release()
+                continue
+            if lease is None or frame is not lease.array:
+                # First frame, or the source changed size: adopt its array into the pool
+                if lease is not None:
+                    lease.release()
+                lease = self.buffer_pool.adopt(frame)
+                self._capture_shape = frame.shape
+            if self.cap.lossless and not self.frame_mailbox.wait_until_empty():
+                lease.release()  # Mailbox closed by stop()
+                continue
+            self.frame_mailbox.put(frame, capture_time, lease, detect=scheduled)
+
+    def _lease_capture_buffer(self):
+        """Lease a buffer for the next captured frame once the frame size is known"""
+        if self._capture_shape is None:
+            return None
+        return self.buffer_pool.lease(self._capture_shape)
+
+    @property
+    def frame_skip(self):
+        return self.rate_controller.frame_skip
+
+    def _schedule_frame(self):
+        """Decide at capture time whether the current frame will be processed"""
+        if not self.rate_controller.schedule():
+            self.frames_skipped += 1
+            return False
+        return True
 
     def set_zoom(self, zoom_factor):
         """Set the zoom factor for the camera"""
@@ -175,298 +374,395 @@ class VideoProcessor:
             except:
                 pass
 
+    def _advance_tracks(self, frame, leases):
+        """Move the tracked boxes with optical flow on a frame that skips inference, and republish.
+
+        The detection view is redrawn with the boxes at their new positions;
+        the residue and mask views and the result data stay those of the
+        last inference frame.
+        """
+        frame_cropped = self.apply_crop_factor(frame, leases)
+        # Inference frames draw no box for a finalized item, so neither do these frames
+        moved = [(track_id, box) for track_id, box in self.flow_tracker.update(frame_cropped)
+                 if track_id in self.tracks and not self.tracks[track_id].finalized]
+        for track_id, (x1, y1, x2, y2) in moved:
+            tracker = self.tracks[track_id]
+            tracker.box = (x1, y1, x2, y2)
+            tracker.centroid = ((x1 + x2) // 2, (y1 + y2) // 2)
+
+        previous = self.acquire_latest_result()
+        if previous is None:
+            return
+        if not self.running:
+            self.release_result(previous)  # stop() has already cleared the results
+            return
+        frames = dict(previous['frames'], model=None)
+        result_leases = []
+        for lease in previous['leases']:
+            if lease.array is previous['frames']['model']:
+                lease.release()  # Replaced by the redrawn detection view below
+            else:
+                result_leases.append(lease)
+        if 'model' in self.subscribed_outputs():
+            lease = self.buffer_pool.lease(frame_cropped.shape)
+            result_leases.append(lease)
+            frames['model'] = lease.array
+            np.copyto(lease.array, frame_cropped)
+            for _, (x1, y1, x2, y2) in moved:
+                cv2.rectangle(lease.array, (x1, y1), (x2, y2), (0, 255, 0), 4)
+        self._publish_result(dict(previous, frames=frames, leases=result_leases))
+
     def _process_frames(self):
+        pin_current_thread('inference')  # Never runs at the same time as this pipeline's own inference
         while self.running:
-            if not self.processing and not self.frame_queue.empty():
-                try:
-                    self.processing = True
-                    frame = self.frame_queue.get()
+            # Sleep until the capture thread publishes a frame or stop() closes the mailbox
+            captured = self.frame_mailbox.wait(self.frame_wait_timeout)
+            if captured is None:
+                continue
+            leases = []  # Buffers used by this frame; published ones move into the result
+            try:
+                self.processing = True
+                frame = captured.image
+                if not captured.detect:
+                    self._advance_tracks(frame, leases)
+                    continue
+                frame_age = captured.age() * 1000
+                
+                # Start timing
+                total_start_time = time.time()
+                
+                # Preprocessing timing (frame skipping already happened at capture)
+                preprocess_start = time.time()
+                # Apply crop factor; the model reads the crop directly, the upscaled copy is only for display
+                frame_cropped = self.apply_crop_factor(frame, leases)
+                crop, (display_scale_x, display_scale_y) = self.crop_view(frame)
+                
+                # Skip inference entirely while the belt is empty
+                occupied = self.motion_gate.update(crop)
+                if occupied:
+                    # Letterbox only the region that changed against the background into the network input
+                    region = None
+                    if self.roi_inference:
+                        region = self.motion_gate.changed_region(crop.shape, self.roi_margin, self.roi_min_size)
+                    if region is None:
+                        region = (0, 0, crop.shape[1], crop.shape[0])
+                    else:
+                        self.frames_roi_cropped += 1
+                    rx1, ry1, rx2, ry2 = region
+                    input_shape = model_input_shape(ry2 - ry1, rx2 - rx1, self.inference_imgsz, self.dynamic_input)
+                    input_tensor, input_scale, input_pad = self.tensor_letterbox(crop[ry1:ry2, rx1:rx2], input_shape)
+                timings = {
+                    'preprocess': (time.time() - preprocess_start) * 1000
+                }
+                
+                # Inference timing
+                inference_start = time.time()
+                if occupied:
+                    # Process frame with YOLO model
+                    detections, masks = self.scheduler.detect(input_tensor, pipeline=self.name, masks=True,
+                                                              conf=self.min_confidence)
+                    detections = unletterbox_boxes(detections, input_scale, input_pad, (rx1, ry1), crop.shape)
+                    if (display_scale_x, display_scale_y) != (1.0, 1.0):
+                        detections[:, [0, 2]] *= display_scale_x
+                        detections[:, [1, 3]] *= display_scale_y
+                    if self.use_masks and masks is not None and len(masks):
+                        masks = InstanceMasks.from_letterboxed(masks, input_scale, input_pad, region,
+                                                               (display_scale_x, display_scale_y),
+                                                               self.mask_downsample)
+                    else:
+                        masks = None
+                else:
+                    detections = NO_DETECTIONS
+                    masks = None
+                timings['inference'] = (time.time() - inference_start) * 1000
+                
+                # Post-processing timing
+                postprocess_start = time.time()
+                
+                # Initialize output frames in recycled buffers
+                # Only the views someone is displaying are rendered; scores are always computed
+                outputs = self.subscribed_outputs()
+                output_leases = {output: self.buffer_pool.lease(frame_cropped.shape) for output in outputs}
+                leases.extend(output_leases.values())
+                model_output = output_leases['model'].array if 'model' in outputs else None
+                residue_detection = output_leases['residue'].array if 'residue' in outputs else None
+                mask_display = output_leases['mask'].array if 'mask' in outputs else None
+                if model_output is not None:
+                    np.copyto(model_output, frame_cropped)
+                if residue_detection is not None:
+                    np.copyto(residue_detection, frame_cropped)
+                if mask_display is not None:
+                    mask_display.fill(0)
+                
+                current_boxes = []
+                object_detected = False
+                current_waste_type = '-'
+                classification = '-'
+                current_obj_id = None
+                current_conf = 0
+                
+                detected_ids = set()
+                now = time.time()
+
+                # Drop finalized tracks that have timed out and tracks that are no longer seen
+                self.tracks.expire(now)
+                
+                # Scale, area and confidence filtering and class mapping for all boxes at once
+                candidates = filter_detections(detections, self.min_detection_area, self.max_detection_area,
+                                               self.min_confidence, self.type_confidence)
+                candidate_types = waste_type_names(candidates['cls'])
+                if self.cascade is not None:
+                    self.cascade.start_frame()
+                residue_map = None  # Built on the first box when residue.frame_map is on
+                
+                # Match every box to the existing tracks in one global assignment
+                assignment_start = time.perf_counter()
+                track_ids = self.tracks.ids()
+                track_boxes = np.array([self.tracks[track_id].box for track_id in track_ids],
+                                       dtype=np.float32).reshape(-1, 4)
+                boxes = np.stack([candidates['x1'], candidates['y1'], candidates['x2'], candidates['y2']], axis=1)
+                matches = assign_detections(track_boxes, boxes, self.track_max_distance, self.track_iou_weight)
+                self.performance_metrics['assignment'].append((time.perf_counter() - assignment_start) * 1000)
+                
+                # Process detections (frame_cropped coordinates, highest confidence first)
+                tracked_boxes = []
+                for (x1, y1, x2, y2, cx, cy, _, conf, cls_id, typed, index), waste_type, match in zip(
+                        candidates.tolist(), candidate_types, matches.tolist()):
+                    centroid = (cx, cy)
                     
-                    # Start timing
-                    total_start_time = time.time()
+                    if match < 0:
+                        tracker = self.tracks.create(centroid, (x1, y1, x2, y2), conf, now)
+                    else:
+                        # Finalized tracks take part too, so an item that was already sorted keeps its ID
+                        tracker = self.tracks[track_ids[match]]
+                        self.tracks.touch(tracker, now)
+                        tracker.stable_count += 1  # Matches are always within track_max_distance
+                        # Follow the item as it moves along the belt
+                        tracker.centroid = centroid
+                        tracker.box = (x1, y1, x2, y2)
+                        
+                        if conf > tracker.confidence:
+                            tracker.confidence = conf
+                            tracker.last_update = now
+                    obj_id = tracker.track_id
                     
-                    # Preprocessing timing
-                    preprocess_start = time.time()
-                    # Apply crop factor
-                    frame_cropped = self.apply_crop_factor(frame)
+                    detected_ids.add(obj_id)
                     
-                    # Skip frames to reduce processing load
-                    self._frame_skip_counter += 1
-                    if self._frame_skip_counter < self.frame_skip:
+                    if tracker.finalized:
                         continue
-                    self._frame_skip_counter = 0
-                    
-                    # Resize frame for processing
-                    frame_small = cv2.resize(frame_cropped, self.processing_size)
-                    timings = {
-                        'preprocess': (time.time() - preprocess_start) * 1000
-                    }
+                    current_obj_id = obj_id  # Only an item still being analysed can be finalized below
+                    tracked_boxes.append((obj_id, (x1, y1, x2, y2)))  # Boxes drawn on this frame
                     
-                    # Inference timing
-                    inference_start = time.time()
-                    # Process frame with YOLO model
-                    results = self.model.predict(frame_small, conf=self.min_confidence, verbose=False)
-                    timings['inference'] = (time.time() - inference_start) * 1000
+                    # Ask the large model when the scout is unsure, or changed its mind about this object
+                    if self.cascade is not None:
+                        scout_cls = cls_id
+                        if self.cascade.needs_refine(conf, scout_cls, tracker.scout_cls):
+                            refined = self.cascade.refine(frame_cropped, (x1, y1, x2, y2), scout_cls, self.name)
+                            if refined is not None:
+                                conf, cls_id = refined
+                                typed = conf > self.type_confidence
+                                waste_type = waste_type_names([cls_id])[0]
+                        tracker.scout_cls = scout_cls
                     
-                    # Post-processing timing
-                    postprocess_start = time.time()
+                    if typed:  # conf above type_confidence
+                        current_waste_type = waste_type
+                        tracker.waste_type = current_waste_type
+                    else:
+                        current_waste_type = 'Unknown'
                     
-                    # Initialize output frames
-                    model_output = frame_cropped.copy()
-                    residue_detection = frame_cropped.copy()
-                    mask_display = np.zeros_like(frame_cropped)
+                    object_detected = True
+                    current_conf = conf
                     
-                    current_boxes = []
-                    object_detected = False
-                    object_mask = np.zeros((frame_cropped.shape[0], frame_cropped.shape[1]), dtype=np.uint8)
-                    current_waste_type = '-'
-                    classification = '-'
-                    current_obj_id = None
+                    if model_output is not None:
+                        box_color = (0, 255, 0)
+                        cv2.rectangle(model_output, (x1, y1), (x2, y2), box_color, 4)
                     
-                    detected_ids = set()
-                    now = time.time()
-
-                    # Reset finalized objects that have timed out
-                    for obj_id in list(self.finalized_ids):
-                        if obj_id in self.finalized_times:
-                            if now - self.finalized_times[obj_id] > self.finalized_timeout:
-                                self.finalized_ids.remove(obj_id)
-                                if obj_id in self.object_trackers:
-                                    del self.object_trackers[obj_id]
-                                if obj_id in self.finalized_times:
-                                    del self.finalized_times[obj_id]
+                    # With a segmentation model only the item's own pixels count, not the belt around it
+                    instance_mask = masks.box_mask(index, (x1, y1, x2, y2)) if masks is not None else None
                     
-                    # Process detections
-                    if results and len(results) > 0:
-                        result = results[0]
-                        if result.boxes and len(result.boxes) > 0:
-                            for box in result.boxes:
-                                conf = float(box.conf[0])
-                                cls_id = int(box.cls[0])
-                                
-                                # Scale coordinates back to original size
-                                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                                scale_x = frame_cropped.shape[1] / self.processing_size[0]
-                                scale_y = frame_cropped.shape[0] / self.processing_size[1]
-                                x1, x2 = int(x1 * scale_x), int(x2 * scale_x)
-                                y1, y2 = int(y1 * scale_y), int(y2 * scale_y)
-                                
-                                # Calculate detection area
-                                detection_area = (x2 - x1) * (y2 - y1)
-                                
-                                # Skip if detection area is too small or too large
-                                if detection_area < self.min_detection_area or detection_area > self.max_detection_area:
-                                    continue
-                                
-                                # Calculate centroid for tracking
-                                centroid = (int((x1 + x2) / 2), int((y1 + y2) / 2))
-                                
-                                # Find matching object ID
-                                obj_id = None
-                                for existing_id, tracker in self.object_trackers.items():
-                                    if existing_id in self.finalized_ids:
-                                        continue
-                                    prev_centroid = tracker['centroid']
-                                    distance = math.hypot(centroid[0] - prev_centroid[0], centroid[1] - prev_centroid[1])
-                                    if distance < 50:
-                                        obj_id = existing_id
-                                        break
-                                
-                                if obj_id is None:
-                                    obj_id = generate_unique_id(self.object_trackers, self.finalized_ids)
-                                    self.object_trackers[obj_id] = {
-                                        'centroid': centroid,
-                                        'timer': now,
-                                        'state': 'analyzing',
-                                        'result': None,
-                                        'confidence': conf,
-                                        'waste_type': None,
-                                        'detection_count': 0,
-                                        'last_update': now,
-                                        'stable_count': 0
-                                    }
-                                else:
-                                    tracker = self.object_trackers[obj_id]
-                                    prev_centroid = tracker['centroid']
-                                    distance = math.hypot(centroid[0] - prev_centroid[0], centroid[1] - prev_centroid[1])
-                                    
-                                    if distance < 50:
-                                        tracker['stable_count'] += 1
-                                    else:
-                                        tracker['stable_count'] = max(0, tracker['stable_count'] - 1)
-                                    
-                                    if conf > tracker.get('confidence', 0):
-                                        tracker['confidence'] = conf
-                                        tracker['centroid'] = centroid
-                                        tracker['last_update'] = now
-                                
-                                detected_ids.add(obj_id)
-                                current_obj_id = obj_id
-                                
-                                if obj_id in self.finalized_ids:
-                                    continue
-                                
-                                waste_types = {
-                                    0: 'HDPE Plastic',
-                                    1: 'PP',
-                                    2: 'PET Bottle',
-                                    3: 'PP',
-                                    4: 'LDPE',
-                                    5: 'HDPE Plastic',
-                                    6: 'Tin Can',
-                                    7: 'UHT Box'
-                                }
-                                
-                                if conf > 0.8: # Confidence level threshold
-                                    current_waste_type = waste_types.get(cls_id, 'Unknown')
-                                    if current_obj_id:
-                                        self.object_trackers[current_obj_id]['waste_type'] = current_waste_type
-                                else:
-                                    current_waste_type = 'Unknown'
-                                
-                                object_detected = True
-                                
-                                box_color = (0, 255, 0)
-                                cv2.rectangle(model_output, (x1, y1), (x2, y2), box_color, 4)
-                                
-                                if hasattr(box, 'masks') and box.masks is not None:
-                                    mask = box.masks.cpu().numpy()[0]
-                                    # Scale mask to original size
-                                    mask = cv2.resize(mask, (frame_cropped.shape[1], frame_cropped.shape[0]))
-                                    object_mask = (mask * 255).astype(np.uint8)
-                                else:
-                                    object_mask[y1:y2, x1:x2] = 255
-                                
-                                cropped_frame = frame_cropped[y1:y2, x1:x2]
-                                if cropped_frame.size > 0:
-                                    residue_detection_cropped, residue_mask = detect_residue_colors(cropped_frame)
-                                    if residue_detection_cropped is not None:
-                                        residue_detection[y1:y2, x1:x2] = residue_detection_cropped
-                                        bbox_area = (x2 - x1) * (y2 - y1)
-                                        contamination_score = calculate_residue_score(residue_mask, bbox_area)
-                                        self.current_contamination_score = contamination_score
-                                        mask_display = cv2.cvtColor(residue_mask, cv2.COLOR_GRAY2BGR)
+                    cropped_frame = frame_cropped[y1:y2, x1:x2]
+                    if cropped_frame.size > 0:
+                        if self.residue_frame_map:
+                            # One residue mask for the whole frame, shared by every box
+                            if residue_map is None:
+                                residue_map = ResidueMap(crop, self.residue_map_scale,
+                                                         (display_scale_x, display_scale_y))
+                            residue_mask = residue_map.box_mask((x1, y1, x2, y2))
+                            if instance_mask is not None:
+                                cv2.bitwise_and(residue_mask, instance_mask, dst=residue_mask)
+                                contamination_score = residue_score(cv2.countNonZero(residue_mask),
+                                                                    cv2.countNonZero(instance_mask))
+                            else:
+                                contamination_score = residue_map.score((x1, y1, x2, y2))
+                        else:
+                            residue_mask = detect_residue_mask(cropped_frame, instance_mask)
+                            if instance_mask is not None:
+                                bbox_area = max(1, cv2.countNonZero(instance_mask))
+                            else:
+                                bbox_area = (x2 - x1) * (y2 - y1)
+                            contamination_score = calculate_residue_score(residue_mask, bbox_area)
+                        self.current_contamination_score = contamination_score
+                        if residue_detection is not None:
+                            residue_detection[y1:y2, x1:x2] = render_residue(cropped_frame, residue_mask)
+                        if mask_display is not None:
+                            mask_display[y1:y2, x1:x2] = residue_mask[:, :, np.newaxis]
+        
+                if self.flow_tracker.enabled:
+                    self.flow_tracker.reset(frame_cropped, tracked_boxes)
+                
+                # Update classification
+                if object_detected:
+                    criteria_met = (current_waste_type != '-')
+                    current_time = time.time()
                     
-                    # Update classification
-                    if object_detected:
-                        criteria_met = (current_waste_type != '-')
-                        current_time = time.time()
-                        
-                        if criteria_met:
-                            if self.detection_start_time is None:
-                                self.detection_start_time = current_time
+                    if criteria_met:
+                        if self.detection_start_time is None:
+                            self.detection_start_time = current_time
+                            classification = 'Analyzing...'
+                        elif current_time - self.detection_start_time >= 0.5:
+                            current_track = self.tracks[current_obj_id] if current_obj_id else None
+                            if current_track and not current_track.finalized and current_track.stable_count >= 5:  # Increased from 3
+                                classification = classify_output(current_waste_type, self.current_contamination_score)
+                                self.tracks.finalize(current_track, {
+                                    'id': current_obj_id,
+                                    'waste_type': current_waste_type,
+                                    'contamination_score': self.current_contamination_score,
+                                    'classification': classification,
+                                    'confidence_level': current_conf
+                                }, current_time)
+                                self.emit_detection_result(current_track.result)
+                            else:
                                 classification = 'Analyzing...'
-                            elif current_time - self.detection_start_time >= 0.5:
-                                if current_obj_id and self.object_trackers[current_obj_id]['stable_count'] >= 5:  # Increased from 3
-                                    classification = classify_output(current_waste_type, self.current_contamination_score)
-                                    self.object_trackers[current_obj_id]['result'] = {
-                                        'id': current_obj_id,
-                                        'waste_type': current_waste_type,
-                                        'contamination_score': self.current_contamination_score,
-                                        'classification': classification,
-                                        'confidence_level': conf if object_detected else 0
-                                    }
-                                    self.object_trackers[current_obj_id]['state'] = 'finalized'
-                                    self.finalized_ids.add(current_obj_id)
-                                    self.finalized_times[current_obj_id] = current_time
-                                    self.emit_detection_result(self.object_trackers[current_obj_id]['result'])
-                                else:
-                                    classification = 'Analyzing...'
-                        else:
-                            missing_criteria = []
-                            if current_waste_type == '-':
-                                missing_criteria.append('Type')
-                            classification = f"Waiting for: {', '.join(missing_criteria)}"
-                            self.detection_start_time = None
                     else:
+                        missing_criteria = []
+                        if current_waste_type == '-':
+                            missing_criteria.append('Type')
+                        classification = f"Waiting for: {', '.join(missing_criteria)}"
                         self.detection_start_time = None
-                        classification = 'No object detected'
-                    
-                    # Add animation to model output
-                    model_output = add_detection_animation(model_output, object_detected, current_boxes, 
-                                                        self.last_classification, self.animation_time)
-                    
-                    # Calculate final timings
-                    timings['postprocess'] = (time.time() - postprocess_start) * 1000
-                    timings['total'] = (time.time() - total_start_time) * 1000
-                    
-                    # Calculate FPS
-                    fps = 1000 / timings['total'] if timings['total'] > 0 else 0
-                    
-                    # Store metrics
-                    self.performance_metrics['fps'].append(fps)
-                    self.performance_metrics['preprocess'].append(timings['preprocess'])
-                    self.performance_metrics['inference'].append(timings['inference'])
-                    self.performance_metrics['postprocess'].append(timings['postprocess'])
-                    self.performance_metrics['total'].append(timings['total'])
-                    
-                    # Store confidence if object is detected
-                    if object_detected and 'conf' in locals():
-                        self.performance_metrics['confidence'].append(conf)
-                    else:
-                        self.performance_metrics['confidence'].append(0.0)
-                    
-                    # Keep only the last 100 measurements
-                    max_metrics = 100
-                    for key in self.performance_metrics:
-                        if len(self.performance_metrics[key]) > max_metrics:
-                            self.performance_metrics[key] = self.performance_metrics[key][-max_metrics:]
-                    
-                    # Print metrics every metrics_interval frames
-                    self.metrics_counter += 1
-                    if self.metrics_counter >= self.metrics_interval:
-                        # Calculate averages
-                        avg_fps = sum(self.performance_metrics['fps']) / len(self.performance_metrics['fps'])
-                        avg_preprocess = sum(self.performance_metrics['preprocess']) / len(self.performance_metrics['preprocess'])
-                        avg_inference = sum(self.performance_metrics['inference']) / len(self.performance_metrics['inference'])
-                        avg_postprocess = sum(self.performance_metrics['postprocess']) / len(self.performance_metrics['postprocess'])
-                        avg_total = sum(self.performance_metrics['total']) / len(self.performance_metrics['total'])
-                        avg_confidence = sum(self.performance_metrics['confidence']) / len(self.performance_metrics['confidence'])
-                        
-                        # Print to terminal with flush=True to ensure immediate output
-                        import sys
-                        sys.stdout.write("\nDetection Performance Metrics (Averaged over last 100 frames):\n")
-                        sys.stdout.write(f"Average FPS: {avg_fps:.2f}\n")
-                        sys.stdout.write(f"Average Preprocessing: {avg_preprocess:.2f} ms\n")
-                        sys.stdout.write(f"Average Inference: {avg_inference:.2f} ms\n")
-                        sys.stdout.write(f"Average Post-processing: {avg_postprocess:.2f} ms\n")
-                        sys.stdout.write(f"Average Total processing time: {avg_total:.2f} ms\n")
-                        sys.stdout.write(f"Average Confidence: {avg_confidence:.2%}\n")
-                        sys.stdout.write("-" * 40 + "\n")
-                        sys.stdout.flush()
-                        
-                        self.metrics_counter = 0
-                    
-                    # Prepare result with all frames
-                    result = {
-                        'frames': {
-                            'model': model_output,
-                            'residue': residue_detection,
-                            'mask': mask_display
-                        },
-                        'data': {
-                            'id': current_obj_id,
-                            'waste_type': current_waste_type,
-                            'confidence_level': conf if object_detected else 0,
-                            'contamination_score': self.current_contamination_score,
-                            'classification': classification,
-                            'processing_time_ms': timings['total']
-                        }
-                    }
-                    self.latest_result = result
-                    
-                    # Update animation time
-                    self.animation_time += 0.1
+                else:
+                    self.detection_start_time = None
+                    classification = 'No object detected'
+                
+                # Add animation to model output
+                if model_output is not None:
+                    model_output = add_detection_animation(model_output, object_detected, current_boxes,
+                                                           self.last_classification, self.animation_time,
+                                                           in_place=True)
+                
+                # Calculate final timings
+                timings['postprocess'] = (time.time() - postprocess_start) * 1000
+                timings['total'] = (time.time() - total_start_time) * 1000
+                
+                # Calculate FPS
+                fps = 1000 / timings['total'] if timings['total'] > 0 else 0
+                
+                # Store metrics
+                self.performance_metrics['fps'].append(fps)
+                self.performance_metrics['preprocess'].append(timings['preprocess'])
+                self.performance_metrics['inference'].append(timings['inference'])
+                self.performance_metrics['postprocess'].append(timings['postprocess'])
+                self.performance_metrics['total'].append(timings['total'])
+                self.performance_metrics['frame_age'].append(frame_age)
+                
+                # Store confidence if object is detected
+                if object_detected and 'conf' in locals():
+                    self.performance_metrics['confidence'].append(conf)
+                else:
+                    self.performance_metrics['confidence'].append(0.0)
+                
+                # Keep only the last 100 measurements
+                max_metrics = 100
+                for key in self.performance_metrics:
+                    if len(self.performance_metrics[key]) > max_metrics:
+                        self.performance_metrics[key] = self.performance_metrics[key][-max_metrics:]
+                if occupied:
+                    # Gated frames cost almost nothing, so they would make the controller drop the skip too far
+                    self.rate_controller.update(self.performance_metrics)
+                
+                # Print metrics every metrics_interval frames
+                self.metrics_counter += 1
+                if self.metrics_counter >= self.metrics_interval:
+                    # Calculate averages
+                    avg_fps = sum(self.performance_metrics['fps']) / len(self.performance_metrics['fps'])
+                    avg_preprocess = sum(self.performance_metrics['preprocess']) / len(self.performance_metrics['preprocess'])
+                    avg_inference = sum(self.performance_metrics['inference']) / len(self.performance_metrics['inference'])
+                    avg_postprocess = sum(self.performance_metrics['postprocess']) / len(self.performance_metrics['postprocess'])
+                    avg_total = sum(self.performance_metrics['total']) / len(self.performance_metrics['total'])
+                    avg_confidence = sum(self.performance_metrics['confidence']) / len(self.performance_metrics['confidence'])
+                    avg_frame_age = sum(self.performance_metrics['frame_age']) / len(self.performance_metrics['frame_age'])
+                    avg_assignment = sum(self.performance_metrics['assignment']) / len(self.performance_metrics['assignment'])
+                    capture_stats = self.frame_mailbox.get_stats()
                     
-                except Exception as e:
-                    print(f"Error in frame processing: {str(e)}")
-                finally:
-                    self.processing = False
+                    # Print to terminal with flush=True to ensure immediate output
+                    import sys
+                    sys.stdout.write(f"\n[{self.name}] Detection Performance Metrics (Averaged over last 100 frames):\n")
+                    sys.stdout.write(f"Average FPS: {avg_fps:.2f}\n")
+                    sys.stdout.write(f"Average Preprocessing: {avg_preprocess:.2f} ms\n")
+                    sys.stdout.write(f"Average Inference: {avg_inference:.2f} ms\n")
+                    sys.stdout.write(f"Average Post-processing: {avg_postprocess:.2f} ms\n")
+                    sys.stdout.write(f"Average Total processing time: {avg_total:.2f} ms\n")
+                    sys.stdout.write(f"Average Track Assignment: {avg_assignment:.2f} ms\n")
+                    sys.stdout.write(f"Average Confidence: {avg_confidence:.2%}\n")
+                    sys.stdout.write(f"Average Frame Age: {avg_frame_age:.2f} ms\n")
+                    sys.stdout.write(f"Frames Captured/Overwritten/Skipped: {capture_stats['captured']}/"
+                                     f"{capture_stats['overwritten']}/{self.frames_skipped}\n")
+                    sys.stdout.write(f"Frames Gated (belt empty): {self.motion_gate.frames_gated}, "
+                                     f"ROI-cropped: {self.frames_roi_cropped}\n")
+                    track_stats = self.tracks.get_stats()
+                    sys.stdout.write(f"Tracks Live/Total: {track_stats['live']}/{track_stats['total']}\n")
+                    if self.flow_tracker.enabled:
+                        sys.stdout.write(f"Frames Tracked Between Detections: {self.flow_tracker.frames_tracked}\n")
+                    if self.cascade is not None:
+                        sys.stdout.write(f"Cascade Refines/Class Changes: {self.cascade.refines}/{self.cascade.changed}\n")
+                    rate_stats = self.rate_controller.get_stats()
+                    sys.stdout.write(f"Frame Skip: {rate_stats['frame_skip']} (latency {rate_stats['latency_ms']:.0f} ms, "
+                                     f"target {rate_stats['target_latency_ms']:.0f} ms)\n")
+                    sys.stdout.write("-" * 40 + "\n")
+                    sys.stdout.flush()
                     
-            time.sleep(0.01)
+                    self.metrics_counter = 0
+                
+                # Prepare result with all frames
+                result = {
+                    'frames': {
+                        'model': model_output,
+                        'residue': residue_detection,  # None unless the output is subscribed
+                        'mask': mask_display
+                    },
+                    'data': {
+                        'id': current_obj_id,
+                        'waste_type': current_waste_type,
+                        'confidence_level': current_conf,
+                        'contamination_score': self.current_contamination_score,
+                        'classification': classification,
+                        'processing_time_ms': timings['total']
+                    },
+                    'residue_coverage': (residue_map.coverage(self.residue_coverage_cell)
+                                         if residue_map is not None else None),
+                    'leases': list(output_leases.values())
+                }
+                for lease in output_leases.values():
+                    leases.remove(lease)
+                self._publish_result(result)
+                self.frames_processed += 1
+                
+                # Update animation time
+                self.animation_time += 0.1
+                
+            except Exception as e:
+                print(f"Error in frame processing: {str(e)}")
+            finally:
+                for lease in leases:
+                    lease.release()
+                captured.release()
+                self.processing = False
 
     def emit_detection_result(self, result_data):
         """Emit detection result and store in database if valid"""
+        if self.detection_callback:
+            self.detection_callback(result_data)
+        if not self.publish_detections:
+            return
         if result_data.get('classification') not in [
             'Analyzing...', 'No object detected',
             'Waiting for: Type', 'Unknown', '-'
@@ -485,7 +781,7 @@ class VideoProcessor:
             
             result_data['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             if 'id' not in result_data:
-                result_data['id'] = generate_unique_id(self.object_trackers, self.finalized_ids)
+                result_data['id'] = generate_unique_id(self.tracks)
             
             store_measurement(result_data)
             app_client.process_detection(result_data)
@@ -591,16 +887,28 @@ class VideoProcessor:
             return True
         return False
 
-    def apply_crop_factor(self, frame):
+    def crop_view(self, frame):
+        """View of the part of frame kept by crop_factor, and the (x, y) scale from it to display size"""
         if self.crop_factor <= 0.9:
-            return frame  # No crop
+            return frame, (1.0, 1.0)  # No crop
         h, w = frame.shape[:2]
         new_w, new_h = int(w / self.crop_factor), int(h / self.crop_factor)
         x1 = (w - new_w) // 2
         y1 = (h - new_h) // 2
-        cropped = frame[y1:y1+new_h, x1:x1+new_w]
+        return frame[y1:y1+new_h, x1:x1+new_w], (w / new_w, h / new_h)
+
+    def apply_crop_factor(self, frame, leases=None):
+        cropped, _ = self.crop_view(frame)
+        if cropped is frame:
+            return frame  # No crop
+        h, w = frame.shape[:2]
         # Resize back to original size for display
-        return cv2.resize(cropped, (w, h), interpolation=cv2.INTER_LINEAR)
+        dst = None
+        if leases is not None:
+            lease = self.buffer_pool.lease(frame.shape)
+            leases.append(lease)
+            dst = lease.array
+        return cv2.resize(cropped, (w, h), dst=dst, interpolation=cv2.INTER_LINEAR)
 
     def get_waste_type(self, class_name):
         """Get the waste type from the class name"""
@@ -654,7 +962,7 @@ class VideoProcessor:
             
             # Inference timing
             inference_start = time.time()
-            results = self.model.predict(frame_cropped, verbose=False, conf=0.5, iou=0.45, max_det=1)
+            results = self.scheduler.predict(frame_cropped, pipeline=self.name, verbose=False, conf=0.5, iou=0.45, max_det=1)
             timings['inference'] = (time.time() - inference_start) * 1000
             
             # Post-processing timing
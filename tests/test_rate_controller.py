@@ -0,0 +1,39 @@
+from src.utils.rate_controller import RateController
+
+
+def simulate(controller, processing_ms, capture_fps=30, seconds=30):
+    """Feed the controller a camera at capture_fps and a pipeline that takes processing_ms per frame.
+
+    A scheduled frame waits for the previous one to finish, so its age is
+    whatever is left of the processing time after the frames skipped in
+    between.
+    """
+    frame_period_ms = 1000.0 / capture_fps
+    metrics = {'total': [], 'frame_age': []}
+    for frame in range(seconds * capture_fps):
+        if controller.schedule():
+            metrics['total'].append(processing_ms)
+            metrics['frame_age'].append(max(0.0, processing_ms - controller.frame_skip * frame_period_ms))
+            controller.update(metrics, now=frame / capture_fps)
+    return controller.frame_skip
+
+
+def test_skip_settles_at_needed_when_processing_alone_is_over_target():
+    # 250 ms * 1.2 headroom at 30 fps needs every 9th frame; skipping more cannot get under 200 ms
+    controller = RateController(frame_skip=3, target_latency_ms=200.0, max_frame_skip=15)
+    assert simulate(controller, processing_ms=250.0) == 9
+
+
+def test_skip_rises_while_frames_queue():
+    controller = RateController(frame_skip=1, target_latency_ms=200.0, max_frame_skip=15)
+    metrics = {'total': [20.0] * 10, 'frame_age': [400.0] * 10}
+    for second in range(4):
+        for _ in range(30):
+            controller.schedule()
+        controller.update(metrics, now=float(second))
+    assert controller.frame_skip == 4
+
+
+def test_skip_falls_to_needed_with_spare_time():
+    controller = RateController(frame_skip=10, target_latency_ms=200.0, max_frame_skip=15)
+    assert simulate(controller, processing_ms=50.0) == 2